@@ -3,11 +3,11 @@ import sys
 import base64
 import json
 import logging
+import threading
 from flask import Flask, request, jsonify
 from flask_cors import CORS
 import cv2
 import numpy as np
-import mediapipe as mp
 import time
 
 # Configure logging
@@ -24,19 +24,50 @@ from modules.squats import count_squats
 from modules.high_knees import count_high_knees
 from modules.mountain_climbers import count_mountain_climber_reps
 from modules.jumping_jacks import count_jumping_jack_reps
-from modules.pose_optimizer import PoseOptimizer
+from modules.pose_estimators import PoseLandmark, create_estimator, landmarks_from_array
+from modules.memory_accounting import MemoryAccountant
+from modules.session_store import SessionStore
+from modules.workout_history import DEFAULT_DB_PATH, WorkoutHistory
 
 app = Flask(__name__)
 CORS(app)  # Enable CORS for all routes
 
-# Initialize MediaPipe pose
-mp_pose = mp.solutions.pose
-pose = mp_pose.Pose(
-    static_image_mode=False,
-    model_complexity=1,
-    min_detection_confidence=0.5,
-    min_tracking_confidence=0.5
+# Pose estimation backend, selected with POSE_BACKEND (mediapipe, onnx or synthetic)
+POSE_BACKEND = os.environ.get('POSE_BACKEND', 'mediapipe')
+POSE_MODEL_PATH = os.environ.get('POSE_MODEL_PATH')
+
+def env_int(name, default=None):
+    value = os.environ.get(name)
+    return int(value) if value else default
+
+# Memory ceilings for retained sessions; least recently used sessions are evicted first
+SESSION_MEMORY_LIMIT_BYTES = env_int('SESSION_MEMORY_LIMIT_BYTES', 1024 * 1024)
+TOTAL_SESSION_MEMORY_LIMIT_BYTES = env_int('TOTAL_SESSION_MEMORY_LIMIT_BYTES', 256 * 1024 * 1024)
+MAX_SESSIONS = env_int('MAX_SESSIONS')
+
+# One estimator serves every session, so its tracking state (MediaPipe crops
+# around the previous frame's pose when static_image_mode is off) carries over
+# between sessions whose frames interleave. That costs a re-detection or a
+# less accurate frame after a switch, in exchange for loading one model instead
+# of one per session. Calls are serialized because neither the MediaPipe graph
+# nor the synthetic RNG is safe to use from several threads.
+memory = MemoryAccountant()
+estimator_lock = threading.Lock()
+estimator = memory.load_model(
+    POSE_BACKEND, lambda: create_estimator(POSE_BACKEND, model_path=POSE_MODEL_PATH)
+)
+logger.info(f"Using pose backend: {POSE_BACKEND}")
+
+sessions = SessionStore(
+    session_limit_bytes=SESSION_MEMORY_LIMIT_BYTES,
+    total_limit_bytes=TOTAL_SESSION_MEMORY_LIMIT_BYTES,
+    max_sessions=MAX_SESSIONS
 )
+memory.register('sessions', sessions.total_bytes)
+
+# Workout history store with rollups maintained as cycles complete
+history = WorkoutHistory(os.environ.get('WORKOUT_HISTORY_DB', DEFAULT_DB_PATH))
+memory.register('history_cache', history.cache_bytes)
 
 # Exercise function mapping for efficient dispatch
 EXERCISE_FUNCTIONS = {
@@ -47,17 +78,8 @@ EXERCISE_FUNCTIONS = {
     'jumping_jacks': count_jumping_jack_reps
 }
 
-# Initialize pose optimizer
-pose_optimizer = PoseOptimizer()
-
-# Global variables to track rep state
-last_exercise = None
-exercise_state = {}
-
 @app.route('/api/process_frame', methods=['POST'])
 def process_frame():
-    global last_exercise, exercise_state
-    
     data = request.json
     if not data or 'image' not in data or 'exercise' not in data:
         return jsonify({'error': 'Missing required data'}), 400
@@ -65,29 +87,40 @@ def process_frame():
     # Get the exercise type
     exercise = data['exercise']
     
-    # Reset state if exercise changed
-    if exercise != last_exercise:
-        logger.info(f"Exercise changed from {last_exercise} to {exercise}. Resetting state.")
-        last_exercise = exercise
-        exercise_state = {}
-    
     if exercise not in EXERCISE_FUNCTIONS:
         return jsonify({'error': f'Unsupported exercise: {exercise}'}), 400
     
+    # Each client keeps its own counters; clients without an id share the default session
+    session = sessions.get(str(data.get('sessionId', 'default')))
+    
+    # Reset state if exercise changed
+    if exercise != session.last_exercise:
+        session.switch_exercise(exercise)
+    
+    try:
+        return track_frame(session, exercise, data['image'])
+    finally:
+        sessions.update(session)
+
+def track_frame(session, exercise, image_data):
+    """Run pose estimation and rep counting on one frame for a session"""
+    session.frames += 1
+    
     # Decode the base64 image
     try:
-        img_data = base64.b64decode(data['image'].split(',')[1])
+        img_data = base64.b64decode(image_data.split(',')[1])
         np_arr = np.frombuffer(img_data, np.uint8)
         image = cv2.imdecode(np_arr, cv2.IMREAD_COLOR)
     except Exception as e:
         return jsonify({'error': f'Error decoding image: {str(e)}'}), 400
     
-    # Process image with MediaPipe
+    # Run pose estimation
     image_rgb = cv2.cvtColor(image, cv2.COLOR_BGR2RGB)
-    results = pose.process(image_rgb)
+    with estimator_lock:
+        landmark_array = estimator.estimate(image_rgb)
     
     # Check if pose was detected
-    if not results.pose_landmarks:
+    if landmark_array is None:
         logger.warning("No pose landmarks detected in frame")
         return jsonify({
             'repCount': 0,
@@ -97,44 +130,39 @@ def process_frame():
         })
     
     # Extract landmarks
-    landmarks = results.pose_landmarks.landmark
+    landmarks = landmarks_from_array(landmark_array)
     
     # Check if we should process the frame (optimization)
-    should_process = pose_optimizer.should_process_frame(landmarks)
+    should_process = session.pose_optimizer.should_process_frame(landmarks)
     
     rep_count = 0
     feedback = "Analyzing pose..."
     
     if should_process:
         # Log key joint positions for debugging
-        hip_y = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y
-        knee_y = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].y
-        ankle_y = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value].y
+        hip_y = landmarks[PoseLandmark.LEFT_HIP.value].y
+        knee_y = landmarks[PoseLandmark.LEFT_KNEE.value].y
+        ankle_y = landmarks[PoseLandmark.LEFT_ANKLE.value].y
         logger.debug(f"Key positions - Hip Y: {hip_y:.4f}, Knee Y: {knee_y:.4f}, Ankle Y: {ankle_y:.4f}")
         
         # Count reps based on exercise type
         logger.info(f"Calling {exercise} rep counter")
         
-        # Initialize exercise state if needed
-        if exercise == 'squats' and 'squat_in_progress' not in exercise_state:
-            from modules.squats import squat_in_progress
-            exercise_state['squat_in_progress'] = squat_in_progress
-        
         # Call the rep counting function and log the result
-        rep_count = EXERCISE_FUNCTIONS[exercise](landmarks)
+        rep_count = session.counter.count(exercise, landmarks)
         logger.info(f"Rep counter returned: {rep_count}")
         
         # For squats, log the squat state
         if exercise == 'squats':
-            from modules.squats import squat_in_progress
+            squat_in_progress = session.counter.state['squats']['squat_in_progress']
             logger.info(f"Squat in progress: {squat_in_progress}")
-            exercise_state['squat_in_progress'] = squat_in_progress
+            session.exercise_state['squat_in_progress'] = squat_in_progress
         
         # Generate feedback based on exercise
         if exercise == 'squats':
-            hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-            knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value]
-            ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
+            hip = landmarks[PoseLandmark.LEFT_HIP.value]
+            knee = landmarks[PoseLandmark.LEFT_KNEE.value]
+            ankle = landmarks[PoseLandmark.LEFT_ANKLE.value]
             
             # Check if knees are over toes (common mistake)
             if knee.x > ankle.x:
@@ -144,10 +172,10 @@ def process_frame():
         elif exercise == 'burpees':
             feedback = "Keep your core tight"
         elif exercise == 'jumping_jacks':
-            shoulder_l = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-            shoulder_r = landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER.value]
-            hand_l = landmarks[mp_pose.PoseLandmark.LEFT_WRIST.value]
-            hand_r = landmarks[mp_pose.PoseLandmark.RIGHT_WRIST.value]
+            shoulder_l = landmarks[PoseLandmark.LEFT_SHOULDER.value]
+            shoulder_r = landmarks[PoseLandmark.RIGHT_SHOULDER.value]
+            hand_l = landmarks[PoseLandmark.LEFT_WRIST.value]
+            hand_r = landmarks[PoseLandmark.RIGHT_WRIST.value]
             
             # Check if arms are fully extended
             if abs(hand_l.y - shoulder_l.y) < 0.15 or abs(hand_r.y - shoulder_r.y) < 0.15:
@@ -184,11 +212,93 @@ def process_frame():
 @app.route('/api/debug_state', methods=['GET'])
 def debug_state():
     """Endpoint to check the internal state for debugging purposes"""
+    session = sessions.sessions.get(request.args.get('session', 'default'))
     return jsonify({
-        'last_exercise': last_exercise,
-        'exercise_state': exercise_state
+        'pose_backend': POSE_BACKEND,
+        'last_exercise': session.last_exercise if session else None,
+        'exercise_state': session.exercise_state if session else {}
     })
 
+@app.route('/api/debug_memory', methods=['GET'])
+def debug_memory():
+    """Endpoint to check memory attributed to models, sessions and caches"""
+    report = memory.report()
+    report['sessions'] = sessions.report(top=request.args.get('top', 10, type=int))
+    return jsonify(report)
+
+@app.route('/api/history/cycles', methods=['POST'])
+def record_history_cycle():
+    """Record a completed cycle and update the history rollups"""
+    data = request.json
+    if not data or 'userId' not in data or 'exercise' not in data or 'reps' not in data:
+        return jsonify({'error': 'Missing required data'}), 400
+    
+    if data['exercise'] not in EXERCISE_FUNCTIONS:
+        return jsonify({'error': f"Unsupported exercise: {data['exercise']}"}), 400
+    
+    try:
+        cycle_id = history.record_cycle(
+            str(data['userId']),
+            data['exercise'],
+            int(data['reps']),
+            set_number=int(data.get('setNumber', 1)),
+            completed_at=data.get('completedAt'),
+            utc_offset_minutes=data.get('utcOffsetMinutes')
+        )
+    except (TypeError, ValueError, OverflowError) as e:
+        return jsonify({'error': str(e)}), 400
+    
+    return jsonify({'id': cycle_id}), 201
+
+@app.route('/api/history/cycles', methods=['GET'])
+def list_history_cycles():
+    """Page through a user's completed cycles, newest first"""
+    user_id = request.args.get('userId')
+    if not user_id:
+        return jsonify({'error': 'Missing userId'}), 400
+    
+    try:
+        return jsonify(history.list_cycles(
+            user_id,
+            start=request.args.get('start', type=float),
+            end=request.args.get('end', type=float),
+            limit=request.args.get('limit', 20, type=int),
+            cursor=request.args.get('cursor')
+        ))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/history/rollups', methods=['GET'])
+def history_rollups():
+    """Per-day or per-week totals per exercise for a date range"""
+    user_id = request.args.get('userId')
+    if not user_id:
+        return jsonify({'error': 'Missing userId'}), 400
+    
+    try:
+        return jsonify(history.rollups(
+            user_id,
+            period=request.args.get('period', 'day'),
+            start_day=request.args.get('start'),
+            end_day=request.args.get('end'),
+            exercise=request.args.get('exercise'),
+            utc_offset_minutes=request.args.get('utcOffset', type=int)
+        ))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
+@app.route('/api/history/summary', methods=['GET'])
+def history_summary():
+    """All-time totals, best sets and streaks for a user"""
+    user_id = request.args.get('userId')
+    if not user_id:
+        return jsonify({'error': 'Missing userId'}), 400
+    
+    try:
+        return jsonify(history.summary(user_id, utc_offset_minutes=request.args.get('utcOffset', type=int)))
+    except ValueError as e:
+        return jsonify({'error': str(e)}), 400
+
 if __name__ == '__main__':
     logger.info("Starting Flask server for fitness tracking API")
     app.run(host='0.0.0.0', port=5000, debug=True) 
\ No newline at end of file
@@ -0,0 +1,41 @@
+"""Import workout_data.csv files written by main.py into the workout history store.
+
+    python import_history.py ../workout_data.csv --user alice
+"""
+import argparse
+import os
+import sys
+from datetime import datetime
+
+sys.path.append(os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from modules.workout_history import DEFAULT_DB_PATH, WorkoutHistory
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Import workout CSV files into the history store')
+    parser.add_argument('paths', nargs='+', help='CSV files with Set Number, Exercise and Reps columns')
+    parser.add_argument('--user', required=True, help='User id to import the workouts for')
+    parser.add_argument('--db', default=os.environ.get('WORKOUT_HISTORY_DB', DEFAULT_DB_PATH),
+                        help='Workout history database path')
+    parser.add_argument('--date', help='Workout time as YYYY-MM-DD[THH:MM] (default: file modification time)')
+    args = parser.parse_args()
+
+    completed_at = datetime.fromisoformat(args.date).timestamp() if args.date else None
+
+    history = WorkoutHistory(args.db)
+    try:
+        total = total_skipped = 0
+        for path in args.paths:
+            count, skipped = history.import_csv(path, args.user, completed_at=completed_at)
+            print(f"Imported {count} cycles from {path}, skipped {skipped} already imported")
+            total += count
+            total_skipped += skipped
+        print(f"Imported {total} cycles for user {args.user} into {args.db}, "
+              f"skipped {total_skipped} already imported")
+    finally:
+        history.close()
+
+
+if __name__ == '__main__':
+    main()
@@ -0,0 +1,159 @@
+"""Long-run memory soak test for the Flask backend.
+
+Pushes hours' worth of frames through /api/process_frame in-process (no
+sleeping between frames), spread across many sessions, and samples RSS as it
+goes. Sessions are replaced by fresh ids as the run goes on, like browser
+tabs coming and going, and the session store is capped so old sessions must
+be evicted. Exits non-zero if RSS keeps growing after warmup or nothing was
+evicted.
+
+By default it uses the synthetic backend on blank frames. To exercise a real
+model's graph state, pick the backend and loop over frames from a video:
+
+    python run_soak.py --hours 2 --fps 10 --sessions 200
+    python run_soak.py --backend mediapipe --video workout.mp4 --hours 1
+"""
+import argparse
+import base64
+import logging
+import os
+import sys
+import tempfile
+
+import cv2
+import numpy as np
+
+EXERCISES = ['squats', 'jumping_jacks', 'high_knees', 'mountain_climbers', 'burpees']
+
+
+def encode_frame(frame):
+    """Encode a BGR frame the way the frontend does (JPEG data URL)"""
+    ok, buffer = cv2.imencode('.jpg', frame)
+    if not ok:
+        raise RuntimeError("Failed to encode soak test frame")
+    return 'data:image/jpeg;base64,' + base64.b64encode(buffer).decode('ascii')
+
+
+def load_frames(video_path, max_frames, width, height):
+    """Encoded frames from a video, or a single blank frame if none is given"""
+    if video_path is None:
+        return [encode_frame(np.zeros((height, width, 3), dtype=np.uint8))]
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video: {video_path}")
+
+    frames = []
+    try:
+        while len(frames) < max_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(encode_frame(frame))
+    finally:
+        cap.release()
+
+    if not frames:
+        raise RuntimeError(f"No frames read from video: {video_path}")
+    return frames
+
+
+def growth_per_hour(samples, fps):
+    """Least squares RSS slope in bytes per simulated hour"""
+    frames = np.array([frame for frame, _ in samples], dtype=np.float64)
+    rss = np.array([rss for _, rss in samples], dtype=np.float64)
+    slope_per_frame = np.polyfit(frames, rss, 1)[0]
+    return slope_per_frame * fps * 3600
+
+
+def main():
+    parser = argparse.ArgumentParser(description='Backend memory soak test')
+    parser.add_argument('--hours', type=float, default=1.0, help='Simulated hours of frames')
+    parser.add_argument('--fps', type=float, default=10.0, help='Simulated frames per second')
+    parser.add_argument('--sessions', type=int, default=100, help='Number of concurrently active sessions')
+    parser.add_argument('--session-frames', type=int, default=600,
+                        help='Frames each session sends before it is replaced by a new session id')
+    parser.add_argument('--sample-every', type=int, default=1000, help='Frames between RSS samples')
+    parser.add_argument('--warmup', type=float, default=0.1,
+                        help='Fraction of the run ignored while caches and allocators settle')
+    parser.add_argument('--max-growth-mb', type=float, default=5.0,
+                        help='Allowed RSS growth per simulated hour after warmup')
+    parser.add_argument('--backend', default=os.environ.get('POSE_BACKEND', 'synthetic'),
+                        help='Pose backend to load (default: synthetic)')
+    parser.add_argument('--model-path', default=os.environ.get('POSE_MODEL_PATH'),
+                        help='Path to a local ONNX model for the onnx backend')
+    parser.add_argument('--video', help='Video whose frames are looped (default: blank frames)')
+    parser.add_argument('--max-video-frames', type=int, default=300,
+                        help='Frames kept in memory from --video')
+    parser.add_argument('--width', type=int, default=320, help='Blank frame width')
+    parser.add_argument('--height', type=int, default=240, help='Blank frame height')
+    args = parser.parse_args()
+
+    # The app reads its configuration at import time
+    os.environ['POSE_BACKEND'] = args.backend
+    if args.model_path:
+        os.environ['POSE_MODEL_PATH'] = args.model_path
+    history_dir = tempfile.TemporaryDirectory()
+    os.environ.setdefault('WORKOUT_HISTORY_DB', os.path.join(history_dir.name, 'soak_history.db'))
+    # Only the active sessions fit, so retired ones have to be evicted
+    os.environ.setdefault('MAX_SESSIONS', str(args.sessions))
+
+    logging.disable(logging.INFO)
+    from app import app, memory, sessions
+    from modules.memory_accounting import current_rss_bytes
+
+    total_frames = int(args.hours * 3600 * args.fps)
+    warmup_frames = int(total_frames * args.warmup)
+    images = load_frames(args.video, args.max_video_frames, args.width, args.height)
+    client = app.test_client()
+
+    print(f"Soak test: {total_frames} frames ({args.hours}h at {args.fps} fps) "
+          f"across {args.sessions} active sessions on the {args.backend} backend, "
+          f"{len(images)} distinct frames")
+    samples = []
+    for frame in range(total_frames):
+        slot = frame % args.sessions
+        # Each slot moves on to a new session id every session_frames of its frames,
+        # staggered so sessions are not all replaced at once
+        generation = (frame // args.sessions + slot * args.session_frames // args.sessions) // args.session_frames
+        session_id = f'soak-{slot}-{generation}'
+        # Rotate exercises slowly so sessions also exercise the state reset path
+        exercise = EXERCISES[(frame // (args.sessions * 100)) % len(EXERCISES)]
+        response = client.post('/api/process_frame', json={
+            'image': images[frame % len(images)],
+            'exercise': exercise,
+            'sessionId': session_id
+        })
+        if response.status_code != 200:
+            print(f"Frame {frame} failed with status {response.status_code}: {response.get_data(as_text=True)}")
+            return 1
+
+        if frame >= warmup_frames and frame % args.sample_every == 0:
+            samples.append((frame, current_rss_bytes()))
+            if len(samples) % 50 == 0:
+                print(f"  frame {frame}: rss {samples[-1][1] / 2**20:.1f} MB, "
+                      f"sessions {sessions.total_bytes() / 2**10:.1f} KB")
+
+    report = memory.report()
+    print(f"Final RSS {report['rss_bytes'] / 2**20:.1f} MB, models {report['models']}, "
+          f"components {report['components']}, evictions {sessions.evictions}")
+
+    if len(samples) < 3:
+        print("Not enough samples to measure growth; increase --hours or lower --sample-every")
+        return 1
+
+    growth_mb = growth_per_hour(samples, args.fps) / 2**20
+    print(f"RSS growth after warmup: {growth_mb:.2f} MB per hour (limit {args.max_growth_mb} MB)")
+    if growth_mb > args.max_growth_mb:
+        print("FAIL: memory keeps growing")
+        return 1
+    if sessions.evictions == 0:
+        print("FAIL: no sessions were evicted; lower --session-frames or lengthen the run")
+        return 1
+
+    print("PASS")
+    return 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
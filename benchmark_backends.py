@@ -0,0 +1,114 @@
+import argparse
+import time
+
+import cv2
+import numpy as np
+
+from modules.pose_estimators import ESTIMATOR_BACKENDS, create_estimator
+
+# Landmarks within this normalized distance of the reference count as agreeing
+AGREEMENT_THRESHOLD = 0.05
+
+def load_frames(video_path, num_frames, width, height):
+    """Read RGB frames from a video file, or blank frames if none is given"""
+    if video_path is None:
+        return [np.zeros((height, width, 3), dtype=np.uint8) for _ in range(num_frames)]
+
+    cap = cv2.VideoCapture(video_path)
+    if not cap.isOpened():
+        raise RuntimeError(f"Cannot open video: {video_path}")
+
+    frames = []
+    try:
+        while len(frames) < num_frames:
+            ret, frame = cap.read()
+            if not ret:
+                break
+            frames.append(cv2.cvtColor(frame, cv2.COLOR_BGR2RGB))
+    finally:
+        cap.release()
+
+    if not frames:
+        raise RuntimeError(f"No frames read from video: {video_path}")
+    return frames
+
+def run_backend(estimator, frames, warmup):
+    """Run the estimator over all frames and return outputs and per-frame latency"""
+    for frame in frames[:warmup]:
+        estimator.estimate(frame)
+
+    outputs = []
+    latencies = []
+    for frame in frames:
+        start = time.perf_counter()
+        outputs.append(estimator.estimate(frame))
+        latencies.append(time.perf_counter() - start)
+    return outputs, np.array(latencies)
+
+def landmark_agreement(outputs, reference):
+    """Compare landmark outputs against a reference backend on the same frames"""
+    both = [(out, ref) for out, ref in zip(outputs, reference) if out is not None and ref is not None]
+    detected_same = sum((out is None) == (ref is None) for out, ref in zip(outputs, reference))
+
+    if not both:
+        return {
+            'detection_agreement': detected_same / len(reference),
+            'mean_error': float('nan'),
+            'pck': float('nan')
+        }
+
+    errors = np.concatenate([
+        np.linalg.norm(out[:, :2] - ref[:, :2], axis=1) for out, ref in both
+    ])
+    return {
+        'detection_agreement': detected_same / len(reference),
+        'mean_error': float(errors.mean()),
+        'pck': float((errors < AGREEMENT_THRESHOLD).mean())
+    }
+
+def main():
+    parser = argparse.ArgumentParser(description='Compare pose estimation backends')
+    parser.add_argument('--backends', nargs='+', default=['mediapipe', 'synthetic'],
+                        choices=sorted(ESTIMATOR_BACKENDS),
+                        help='Backends to compare; the first one that reads the image is the agreement reference')
+    parser.add_argument('--video', help='Video file to use as input; required unless only the synthetic '
+                                        'backend is run, which ignores its input')
+    parser.add_argument('--model-path', help='Path to a local ONNX model for the onnx backend')
+    parser.add_argument('--frames', type=int, default=200, help='Number of frames to process')
+    parser.add_argument('--warmup', type=int, default=10, help='Untimed warmup frames per backend')
+    parser.add_argument('--width', type=int, default=640)
+    parser.add_argument('--height', type=int, default=480)
+    args = parser.parse_args()
+
+    # Real backends detect nothing on blank frames, so agreement would be meaningless
+    if args.video is None and any(ESTIMATOR_BACKENDS[b].reads_image for b in args.backends):
+        parser.error('--video is required to benchmark backends that read the image')
+
+    frames = load_frames(args.video, args.frames, args.width, args.height)
+    print(f"Benchmarking {len(frames)} frames of {frames[0].shape[1]}x{frames[0].shape[0]}")
+
+    reference = None
+    print(f"{'backend':<12}{'fps':>10}{'p50 ms':>10}{'p95 ms':>10}{'detected':>10}"
+          f"{'det agree':>11}{'mean err':>10}{'pck':>8}")
+    for backend in args.backends:
+        with create_estimator(backend, model_path=args.model_path) as estimator:
+            outputs, latencies = run_backend(estimator, frames, args.warmup)
+
+        detected = sum(out is not None for out in outputs) / len(outputs)
+        timing = (f"{backend:<12}{1 / latencies.mean():>10.1f}"
+                  f"{np.percentile(latencies, 50) * 1000:>10.2f}{np.percentile(latencies, 95) * 1000:>10.2f}"
+                  f"{detected:>10.0%}")
+
+        # Backends that ignore the image have nothing to agree or disagree on
+        if not ESTIMATOR_BACKENDS[backend].reads_image:
+            print(f"{timing}{'n/a':>11}{'n/a':>10}{'n/a':>8}")
+            continue
+
+        if reference is None:
+            reference = outputs
+        agreement = landmark_agreement(outputs, reference)
+        print(f"{timing}{agreement['detection_agreement']:>11.0%}"
+              f"{agreement['mean_error']:>10.4f}{agreement['pck']:>8.0%}")
+
+if __name__ == '__main__':
+    main()
@@ -1,13 +1,18 @@
+import argparse
 import cv2
-import mediapipe as mp
 import time
 import pandas as pd 
+import os
+import sqlite3
 from modules.burpees import count_burpee_reps as burpees
 from modules.squats import count_squats as squats
 from modules.high_knees import count_high_knees as highknees
 from modules.mountain_climbers import count_mountain_climber_reps as mountainclimbers
 from modules.jumping_jacks import count_jumping_jack_reps as jumpingjacks
 from modules.pose_optimizer import PoseOptimizer
+from modules.pose_estimators import ESTIMATOR_BACKENDS, OnnxEstimator, create_estimator, draw_landmarks, landmarks_from_array
+from modules.multi_station import Station, run_stations
+from modules.workout_history import DEFAULT_DB_PATH, WorkoutHistory
 import subprocess
 
 # Exercise function mapping for efficient dispatch
@@ -19,10 +24,6 @@ EXERCISE_FUNCTIONS = {
     'jumping_jacks': jumpingjacks
 }
 
-mp_pose = mp.solutions.pose
-pose = mp_pose.Pose()
-mp_drawing = mp.solutions.drawing_utils
-
 def get_valid_input(prompt, input_type=int, min_value=0):
     while True:
         try:
@@ -50,10 +51,72 @@ def check_timeout(start_time, max_duration):
     """Check if operation has exceeded maximum duration"""
     return time.time() - start_time > max_duration
 
+def parse_args():
+    parser = argparse.ArgumentParser(description='Desktop workout tracker')
+    parser.add_argument('--backend', default='mediapipe', choices=sorted(ESTIMATOR_BACKENDS),
+                        help='Pose estimation backend (default: mediapipe)')
+    parser.add_argument('--model-path', help='Path to a local ONNX model for the onnx backend')
+    parser.add_argument('--station', action='append', metavar='SOURCE:EXERCISE',
+                        help='Track a station, e.g. 0:squats or rtsp://cam/stream:burpees. '
+                             'Repeat for multiple stations')
+    parser.add_argument('--duration', type=float, help='Stop multi-station mode after this many seconds')
+    parser.add_argument('--headless', action='store_true', help='Run multi-station mode without a display')
+    parser.add_argument('--workers', type=int, help='Inference worker threads (default: CPU count)')
+    parser.add_argument('--results-file', help='Append per-station JSON line results here (default: stdout)')
+    parser.add_argument('--user', default='local', help='User id for the workout history (default: local)')
+    parser.add_argument('--history-db', default=DEFAULT_DB_PATH, help='Workout history database path')
+    return parser.parse_args()
+
+def parse_station(spec):
+    source, _, exercise = spec.rpartition(':')
+    exercise = exercise.lower()
+    if not source or exercise not in EXERCISE_FUNCTIONS:
+        raise ValueError(f"Invalid station '{spec}'. Use SOURCE:EXERCISE with one of: {', '.join(EXERCISE_FUNCTIONS.keys())}")
+    return source, exercise
+
+def run_multi_station(args):
+    num_workers = args.workers or os.cpu_count() or 1
+    # Each worker runs one model at a time, so split the cores between workers instead of
+    # letting every station's ONNX session start its own thread per core
+    estimator_kwargs = {}
+    if args.backend == OnnxEstimator.name:
+        estimator_kwargs['num_threads'] = max(1, (os.cpu_count() or 1) // num_workers)
+
+    stations = []
+    try:
+        for station_id, spec in enumerate(args.station):
+            source, exercise = parse_station(spec)
+            estimator = create_estimator(args.backend, model_path=args.model_path, **estimator_kwargs)
+            stations.append(Station(station_id, source, exercise, estimator))
+    except Exception:
+        for station in stations:
+            station.estimator.close()
+        raise
+
+    final_stats = run_stations(
+        stations,
+        duration=args.duration,
+        headless=args.headless,
+        num_workers=num_workers,
+        results_path=args.results_file
+    )
+    for stats in final_stats:
+        print(f"Station {stats['station']} ({stats['exercise']}): {stats['reps']} reps, "
+              f"{stats['inference_fps']} fps, {stats['dropped']} dropped frames")
+
 def main():
+    args = parse_args()
+    if args.station:
+        run_multi_station(args)
+        return
+
     cap = None
+    estimator = None
+    history = None
     try:
-        # Initialize pose optimizer
+        # Initialize pose estimator and optimizer
+        estimator = create_estimator(args.backend, model_path=args.model_path)
+        history = WorkoutHistory(args.history_db)
         pose_optimizer = PoseOptimizer()
         
         # Placeholder for workout data
@@ -149,10 +212,10 @@ def main():
                     try:
                         # Process pose landmarks
                         image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
-                        results = pose.process(image_rgb)
+                        landmark_array = estimator.estimate(image_rgb)
 
-                        if results.pose_landmarks:
-                            landmarks = results.pose_landmarks.landmark
+                        if landmark_array is not None:
+                            landmarks = landmarks_from_array(landmark_array)
                             
                             if pose_optimizer.should_process_frame(landmarks):
                                 if workout_name in EXERCISE_FUNCTIONS:
@@ -164,14 +227,7 @@ def main():
                         timer_display = f"{minutes:02}:{seconds:02}"
 
                         # Drawing pose landmarks
-                        if results.pose_landmarks:
-                            mp_drawing.draw_landmarks(
-                                frame,
-                                results.pose_landmarks,
-                                mp_pose.POSE_CONNECTIONS,
-                                mp_drawing.DrawingSpec(color=(0, 0, 255), thickness=2, circle_radius=2),
-                                mp_drawing.DrawingSpec(color=(0, 255, 0), thickness=2, circle_radius=2)
-                            )
+                        draw_landmarks(frame, landmark_array)
 
                         # Overlay text
                         cv2.putText(frame, f'Workout: {workout_name.title()}', (10, 30), cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
@@ -190,6 +246,11 @@ def main():
                 # Update workout data
                 reps_dict[workout_name] += rep_counter
                 workout_rows.append({'Set Number': set_num, 'Exercise': workout_name, 'Reps': rep_counter})
+                try:
+                    history.record_cycle(args.user, workout_name, rep_counter, set_number=set_num)
+                except sqlite3.Error as e:
+                    # The CSV is still written, so a failed history write must not end the workout
+                    print(f"Failed to save cycle to workout history: {e}")
                 print(f'Completed {workout_name} for set {set_num}, cycle {cycle_num}, reps: {rep_counter}')
 
                 # Rest period
@@ -222,6 +283,10 @@ def main():
     except Exception as e:
         print(f"An error occurred: {e}")
     finally:
+        if estimator is not None:
+            estimator.close()
+        if history is not None:
+            history.close()
         cleanup_resources(cap)
 
 if __name__ == '__main__':
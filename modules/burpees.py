@@ -1,7 +1,4 @@
-import mediapipe as mp
-
-# Initialize MediaPipe Pose model
-mp_pose = mp.solutions.pose
+from modules.pose_estimators import PoseLandmark
 
 # Define the exercise threshold and counter
 threshold = 0.76  # Adjust based on your exercise
@@ -11,8 +8,8 @@ def count_burpee_reps(landmarks):
     global is_up
     reps_increment = 0
     # Average y-coordinates of hips
-    hip_y = (landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].y + 
-            landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value].y) / 2  
+    hip_y = (landmarks[PoseLandmark.LEFT_HIP.value].y + 
+            landmarks[PoseLandmark.RIGHT_HIP.value].y) / 2  
     
     # Check for the threshold condition to count reps
     if is_up and hip_y < threshold:
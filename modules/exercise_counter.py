@@ -0,0 +1,61 @@
+import threading
+
+from modules import burpees, high_knees, jumping_jacks, mountain_climbers, squats
+
+# Rep counter function and the module globals that hold its state, per exercise
+COUNTER_MODULES = {
+    'burpees': (burpees, burpees.count_burpee_reps, ('is_up',)),
+    'squats': (squats, squats.count_squats, ('squat_in_progress', 'debug_counter')),
+    'high_knees': (high_knees, high_knees.count_high_knees, ('high_knee_in_progress',)),
+    'mountain_climbers': (mountain_climbers, mountain_climbers.count_mountain_climber_reps,
+                          ('right_knee_in', 'left_knee_in')),
+    'jumping_jacks': (jumping_jacks, jumping_jacks.count_jumping_jack_reps, ('is_open',)),
+}
+
+# The rep counters keep their state in module globals, so calls are serialized
+# and each ExerciseCounter swaps its own state in and out around the call
+_counter_lock = threading.Lock()
+
+
+class ExerciseCounter:
+    """Rep counting with state owned by the instance instead of the module.
+
+    Lets several stations or sessions count the same exercise independently.
+    """
+
+    def __init__(self):
+        self.state = {}
+        self.reset()
+
+    def reset(self):
+        """Reset every exercise to the module's initial state"""
+        self.state = {
+            exercise: {name: _INITIAL_STATE[exercise][name] for name in names}
+            for exercise, (_, _, names) in COUNTER_MODULES.items()
+        }
+
+    def count(self, exercise, landmarks):
+        """Run the rep counter for an exercise, returning 1 when a rep completes"""
+        module, count_fn, names = COUNTER_MODULES[exercise]
+        state = self.state[exercise]
+
+        with _counter_lock:
+            saved = {name: getattr(module, name) for name in names}
+            try:
+                for name in names:
+                    setattr(module, name, state[name])
+                reps = count_fn(landmarks)
+                for name in names:
+                    state[name] = getattr(module, name)
+            finally:
+                for name, value in saved.items():
+                    setattr(module, name, value)
+
+        return reps
+
+
+# Snapshot of the module globals at import time, used to reset counters
+_INITIAL_STATE = {
+    exercise: {name: getattr(module, name) for name in names}
+    for exercise, (module, _, names) in COUNTER_MODULES.items()
+}
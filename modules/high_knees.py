@@ -1,17 +1,14 @@
 # high_knees.py
 
-import mediapipe as mp
+from modules.pose_estimators import PoseLandmark
 import numpy as np
 
-mp_pose = mp.solutions.pose
-pose = mp_pose.Pose()
-
 alignment_tolerance = 0.1  # Adjust as necessary
 high_knee_in_progress = False  # Global variable for high knee state
 
 def check_high_knee_conditions(landmarks):
-    hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-    knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value]
+    hip = landmarks[PoseLandmark.LEFT_HIP.value]
+    knee = landmarks[PoseLandmark.LEFT_KNEE.value]
 
     hip_pos = np.array([hip.x, hip.y])
     knee_pos = np.array([knee.x, knee.y])
@@ -1,9 +1,6 @@
-import mediapipe as mp
+from modules.pose_estimators import PoseLandmark
 import numpy as np
 
-# Initialize MediaPipe Pose model
-mp_pose = mp.solutions.pose
-
 # Jumping Jack state tracking
 is_open = False
 
@@ -15,14 +12,14 @@ def count_jumping_jack_reps(landmarks):
     reps_increment = 0
 
     # Extract relevant landmarks
-    shoulder_l = (landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER].x, landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER].y)
-    shoulder_r = (landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER].x, landmarks[mp_pose.PoseLandmark.RIGHT_SHOULDER].y)
-    wrist_l = (landmarks[mp_pose.PoseLandmark.LEFT_WRIST].x, landmarks[mp_pose.PoseLandmark.LEFT_WRIST].y)
-    wrist_r = (landmarks[mp_pose.PoseLandmark.RIGHT_WRIST].x, landmarks[mp_pose.PoseLandmark.RIGHT_WRIST].y)
-    hip_l = (landmarks[mp_pose.PoseLandmark.LEFT_HIP].x, landmarks[mp_pose.PoseLandmark.LEFT_HIP].y)
-    hip_r = (landmarks[mp_pose.PoseLandmark.RIGHT_HIP].x, landmarks[mp_pose.PoseLandmark.RIGHT_HIP].y)
-    toe_l = (landmarks[mp_pose.PoseLandmark.LEFT_FOOT_INDEX].x, landmarks[mp_pose.PoseLandmark.LEFT_FOOT_INDEX].y)
-    toe_r = (landmarks[mp_pose.PoseLandmark.RIGHT_FOOT_INDEX].x, landmarks[mp_pose.PoseLandmark.RIGHT_FOOT_INDEX].y)
+    shoulder_l = (landmarks[PoseLandmark.LEFT_SHOULDER].x, landmarks[PoseLandmark.LEFT_SHOULDER].y)
+    shoulder_r = (landmarks[PoseLandmark.RIGHT_SHOULDER].x, landmarks[PoseLandmark.RIGHT_SHOULDER].y)
+    wrist_l = (landmarks[PoseLandmark.LEFT_WRIST].x, landmarks[PoseLandmark.LEFT_WRIST].y)
+    wrist_r = (landmarks[PoseLandmark.RIGHT_WRIST].x, landmarks[PoseLandmark.RIGHT_WRIST].y)
+    hip_l = (landmarks[PoseLandmark.LEFT_HIP].x, landmarks[PoseLandmark.LEFT_HIP].y)
+    hip_r = (landmarks[PoseLandmark.RIGHT_HIP].x, landmarks[PoseLandmark.RIGHT_HIP].y)
+    toe_l = (landmarks[PoseLandmark.LEFT_FOOT_INDEX].x, landmarks[PoseLandmark.LEFT_FOOT_INDEX].y)
+    toe_r = (landmarks[PoseLandmark.RIGHT_FOOT_INDEX].x, landmarks[PoseLandmark.RIGHT_FOOT_INDEX].y)
 
     # **Arm and Foot Movement Detection Without Thresholds**
     arm_length = calculate_distance(shoulder_l, wrist_l)
@@ -0,0 +1,95 @@
+import gc
+import os
+import sys
+import threading
+import types
+from collections import deque
+
+import numpy as np
+
+# Objects that are shared process-wide and should never be charged to a component
+_SKIP_TYPES = (types.ModuleType, types.FunctionType, types.BuiltinFunctionType,
+               types.MethodType, type, threading.Lock().__class__)
+
+
+def current_rss_bytes():
+    """Resident set size of this process in bytes"""
+    try:
+        with open('/proc/self/statm') as f:
+            resident_pages = int(f.read().split()[1])
+        return resident_pages * os.sysconf('SC_PAGE_SIZE')
+    except (OSError, ValueError, IndexError):
+        # Not Linux: fall back to peak RSS, reported in KB on Linux/BSD and bytes on macOS
+        import resource
+        peak = resource.getrusage(resource.RUSAGE_SELF).ru_maxrss
+        return peak if sys.platform == 'darwin' else peak * 1024
+
+
+def deep_sizeof(obj, seen=None):
+    """Approximate memory held by an object and everything it references"""
+    if seen is None:
+        seen = set()
+    if id(obj) in seen or isinstance(obj, _SKIP_TYPES):
+        return 0
+    seen.add(id(obj))
+
+    if isinstance(obj, np.ndarray):
+        # Includes the data buffer for arrays that own it, only the header for views
+        return sys.getsizeof(obj)
+
+    size = sys.getsizeof(obj)
+    if isinstance(obj, dict):
+        size += sum(deep_sizeof(k, seen) + deep_sizeof(v, seen) for k, v in obj.items())
+    elif isinstance(obj, (list, tuple, set, frozenset, deque)):
+        size += sum(deep_sizeof(item, seen) for item in obj)
+    elif hasattr(obj, '__dict__'):
+        size += deep_sizeof(vars(obj), seen)
+    elif hasattr(obj, '__slots__'):
+        size += sum(deep_sizeof(getattr(obj, name), seen)
+                    for name in obj.__slots__ if hasattr(obj, name))
+    return size
+
+
+class MemoryAccountant:
+    """Attributes process memory to named components.
+
+    Models are charged the RSS growth measured while they load, since their
+    weights live in native memory. Other components (session stores, caches)
+    register a sizer callable that reports their current bytes on demand.
+    """
+
+    def __init__(self):
+        self.lock = threading.Lock()
+        self.models = {}
+        self.components = {}
+
+    def load_model(self, name, loader):
+        """Call loader() and charge the RSS it adds to the named model"""
+        gc.collect()
+        before = current_rss_bytes()
+        model = loader()
+        gc.collect()
+        with self.lock:
+            self.models[name] = max(current_rss_bytes() - before, 0)
+        return model
+
+    def register(self, name, sizer):
+        """Register a component whose size in bytes is reported by sizer()"""
+        with self.lock:
+            self.components[name] = sizer
+
+    def report(self):
+        with self.lock:
+            models = dict(self.models)
+            components = dict(self.components)
+
+        component_bytes = {name: sizer() for name, sizer in components.items()}
+        rss = current_rss_bytes()
+        accounted = sum(models.values()) + sum(component_bytes.values())
+        return {
+            'rss_bytes': rss,
+            'models': models,
+            'components': component_bytes,
+            'accounted_bytes': accounted,
+            'unaccounted_bytes': max(rss - accounted, 0)
+        }
@@ -1,7 +1,4 @@
-import mediapipe as mp
-
-# Initialize MediaPipe Pose model
-mp_pose = mp.solutions.pose
+from modules.pose_estimators import PoseLandmark
 
 # Define threshold for knee movement
 knee_in_threshold = -0.05  # Knee should move towards negative x-axis (above hip)
@@ -13,10 +10,10 @@ def count_mountain_climber_reps(landmarks):
     reps_increment = 0
 
     # Get x-coordinates for knees and hips
-    left_knee_x = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value].x
-    right_knee_x = landmarks[mp_pose.PoseLandmark.RIGHT_KNEE.value].x
-    left_hip_x = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value].x
-    right_hip_x = landmarks[mp_pose.PoseLandmark.RIGHT_HIP.value].x
+    left_knee_x = landmarks[PoseLandmark.LEFT_KNEE.value].x
+    right_knee_x = landmarks[PoseLandmark.RIGHT_KNEE.value].x
+    left_hip_x = landmarks[PoseLandmark.LEFT_HIP.value].x
+    right_hip_x = landmarks[PoseLandmark.RIGHT_HIP.value].x
 
     # Calculate relative position of knees to hips
     right_knee_relative_x = right_knee_x - right_hip_x
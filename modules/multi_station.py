@@ -0,0 +1,349 @@
+import json
+import logging
+import math
+import os
+import queue
+import sys
+import threading
+import time
+
+import cv2
+import numpy as np
+
+from modules.exercise_counter import ExerciseCounter
+from modules.pose_estimators import draw_landmarks, landmarks_from_array
+from modules.pose_optimizer import PoseOptimizer
+
+logger = logging.getLogger(__name__)
+
+
+# Backoff between attempts to reopen a camera or stream that stopped delivering frames
+RECONNECT_INITIAL_DELAY = 0.5
+RECONNECT_MAX_DELAY = 8.0
+
+
+def parse_source(source):
+    """Camera sources are given as device indices, anything else is a file or stream URL"""
+    return int(source) if source.isdigit() else source
+
+
+class Station:
+    """One camera or stream with its own pose model, optimizer and counter state"""
+
+    def __init__(self, station_id, source, exercise, estimator, flip_horizontal=True):
+        self.station_id = station_id
+        self.source = source
+        self.exercise = exercise
+        self.estimator = estimator
+        self.flip_horizontal = flip_horizontal
+
+        self.pose_optimizer = PoseOptimizer()
+        self.pose_optimizer.adjust_thresholds(exercise)
+        self.counter = ExerciseCounter()
+
+        parsed = parse_source(source)
+        self.is_device = isinstance(parsed, int)
+        self.is_file = not self.is_device and os.path.isfile(parsed)
+
+        self.cap = None
+        self.source_fps = 0.0
+        self.capture_thread = None
+        self.running = False
+        self.stop_event = threading.Event()  # Wakes the capture thread from pacing and backoff sleeps
+        self.finished = False
+
+        # Single slot frame buffer: frames not picked up before the next one arrives are dropped
+        self.lock = threading.Lock()
+        self.pending_frame = None
+        self.scheduled = False
+        self.display_frame = None
+
+        self.reps = 0
+        self.captured = 0
+        self.processed = 0
+        self.dropped = 0
+        self.reconnects = 0
+        self.start_time = None
+
+    def open(self):
+        self.cap = cv2.VideoCapture(parse_source(self.source))
+        if not self.cap.isOpened():
+            raise RuntimeError(f"Cannot open source for station {self.station_id}: {self.source}")
+        # Files are paced to their native rate. Cameras and live streams already block until
+        # the next frame, and sleeping on top of that would let the decoder buffer back up
+        self.source_fps = (self.cap.get(cv2.CAP_PROP_FPS) or 0.0) if self.is_file else 0.0
+
+    def _reconnect(self):
+        """Reopen a camera or stream with exponential backoff. Returns False if stopped first"""
+        delay = RECONNECT_INITIAL_DELAY
+        while self.running:
+            logger.warning(f"Station {self.station_id} lost its source, reopening in {delay:.1f}s")
+            if self.stop_event.wait(delay) or not self.running:
+                return False
+            self.cap.release()
+            try:
+                self.open()
+                self.reconnects += 1
+                return True
+            except RuntimeError as e:
+                logger.warning(str(e))
+            delay = min(delay * 2, RECONNECT_MAX_DELAY)
+        return False
+
+    def start(self, scheduler):
+        self.running = True
+        self.stop_event.clear()
+        self.start_time = time.time()
+        self.capture_thread = threading.Thread(
+            target=self._capture_loop, args=(scheduler,),
+            name=f'capture-{self.station_id}', daemon=True
+        )
+        self.capture_thread.start()
+
+    def stop(self):
+        self.running = False
+        self.stop_event.set()
+        if self.capture_thread is not None:
+            self.capture_thread.join(timeout=2)
+
+    def close(self):
+        # A capture thread still blocked in read() releases the capture itself on exit
+        if self.cap is not None and not (self.capture_thread and self.capture_thread.is_alive()):
+            self.cap.release()
+        self.estimator.close()
+
+    def _capture_loop(self, scheduler):
+        try:
+            self._read_frames(scheduler)
+        finally:
+            self.cap.release()
+            self.finished = True
+
+    def _read_frames(self, scheduler):
+        next_frame_time = time.time()
+        while self.running:
+            if self.source_fps > 0:
+                # Read at the source's frame rate instead of as fast as it decodes
+                delay = next_frame_time - time.time()
+                if delay > 0:
+                    if self.stop_event.wait(delay):
+                        break
+                elif delay < -1.0:
+                    next_frame_time = time.time()  # Fell behind, don't burst to catch up
+                next_frame_time += 1.0 / self.source_fps
+
+            ret, frame = self.cap.read()
+            if not ret:
+                if self.is_file:
+                    logger.info(f"Station {self.station_id} source ended")
+                    break
+                if not self._reconnect():
+                    break
+                next_frame_time = time.time()
+                continue
+
+            with self.lock:
+                self.captured += 1
+                if self.pending_frame is not None:
+                    self.dropped += 1
+                self.pending_frame = frame
+                submit = not self.scheduled
+                self.scheduled = True
+
+            if submit:
+                scheduler.submit(self)
+
+    def process_pending(self):
+        """Run inference on the latest frame. Returns True if another frame is waiting"""
+        with self.lock:
+            frame = self.pending_frame
+            self.pending_frame = None
+
+        if frame is not None:
+            try:
+                self._process_frame(frame)
+            except Exception as e:
+                logger.error(f"Error processing frame on station {self.station_id}: {e}")
+
+        with self.lock:
+            if self.pending_frame is None:
+                self.scheduled = False
+                return False
+            return True
+
+    def _process_frame(self, frame):
+        if self.flip_horizontal:
+            frame = cv2.flip(frame, 1)
+
+        image_rgb = cv2.cvtColor(frame, cv2.COLOR_BGR2RGB)
+        landmark_array = self.estimator.estimate(image_rgb)
+
+        rep_increment = 0
+        if landmark_array is not None:
+            landmarks = landmarks_from_array(landmark_array)
+            if self.pose_optimizer.should_process_frame(landmarks):
+                rep_increment = self.counter.count(self.exercise, landmarks)
+
+        draw_landmarks(frame, landmark_array)
+        cv2.putText(frame, f'Station {self.station_id}: {self.exercise.title()}', (10, 30),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+        cv2.putText(frame, f'Reps: {self.reps + rep_increment}', (10, 70),
+                    cv2.FONT_HERSHEY_SIMPLEX, 1, (0, 255, 0), 2)
+
+        with self.lock:
+            self.reps += rep_increment
+            self.processed += 1
+            self.display_frame = frame
+
+        return rep_increment
+
+    def stats(self):
+        elapsed = max(time.time() - self.start_time, 1e-6) if self.start_time else 0
+        with self.lock:
+            return {
+                'station': self.station_id,
+                'source': str(self.source),
+                'exercise': self.exercise,
+                'reps': self.reps,
+                'captured': self.captured,
+                'processed': self.processed,
+                'dropped': self.dropped,
+                'reconnects': self.reconnects,
+                'capture_fps': round(self.captured / elapsed, 1) if elapsed else 0.0,
+                'inference_fps': round(self.processed / elapsed, 1) if elapsed else 0.0,
+            }
+
+
+class InferenceScheduler:
+    """Fixed pool of inference workers shared by all stations.
+
+    Stations with a new frame join a FIFO queue and go to the back after each
+    frame, so every station gets a turn before any station gets a second one.
+    A station is only ever processed by one worker at a time.
+    """
+
+    def __init__(self, num_workers=None):
+        self.num_workers = num_workers or os.cpu_count() or 1
+        self.ready = queue.Queue()
+        self.workers = []
+
+    def start(self):
+        for i in range(self.num_workers):
+            worker = threading.Thread(target=self._worker_loop, name=f'inference-{i}', daemon=True)
+            worker.start()
+            self.workers.append(worker)
+
+    def submit(self, station):
+        self.ready.put(station)
+
+    def stop(self):
+        for _ in self.workers:
+            self.ready.put(None)
+        for worker in self.workers:
+            worker.join(timeout=5)
+
+    def _worker_loop(self):
+        while True:
+            station = self.ready.get()
+            if station is None:
+                break
+            if station.process_pending():
+                self.ready.put(station)
+
+
+class ResultsStream:
+    """Writes per-station results as JSON lines to a file or stdout"""
+
+    def __init__(self, path=None):
+        self.lock = threading.Lock()
+        self.file = open(path, 'a') if path else sys.stdout
+        self.owns_file = path is not None
+
+    def write(self, record):
+        record = {'time': round(time.time(), 3), **record}
+        with self.lock:
+            self.file.write(json.dumps(record) + '\n')
+            self.file.flush()
+
+    def close(self):
+        if self.owns_file:
+            self.file.close()
+
+
+def tile_frames(frames, labels, tile_width=640, tile_height=480):
+    """Arrange station frames in a near-square grid with a label under each tile"""
+    cols = math.ceil(math.sqrt(len(frames)))
+    rows = math.ceil(len(frames) / cols)
+    grid = np.zeros((rows * tile_height, cols * tile_width, 3), dtype=np.uint8)
+
+    for i, (frame, label) in enumerate(zip(frames, labels)):
+        row, col = divmod(i, cols)
+        x, y = col * tile_width, row * tile_height
+        if frame is not None:
+            grid[y:y + tile_height, x:x + tile_width] = cv2.resize(frame, (tile_width, tile_height))
+        cv2.putText(grid, label, (x + 10, y + tile_height - 10),
+                    cv2.FONT_HERSHEY_SIMPLEX, 0.6, (255, 255, 0), 2)
+    return grid
+
+
+def run_stations(stations, duration=None, headless=False, num_workers=None,
+                 results_path=None, stats_interval=5.0):
+    """Run all stations concurrently until the duration passes, sources end or 'q' is pressed"""
+    scheduler = InferenceScheduler(num_workers)
+    results = ResultsStream(results_path)
+    last_reps = {station.station_id: 0 for station in stations}
+
+    try:
+        for station in stations:
+            station.open()
+
+        logger.info(f"Running {len(stations)} stations on {scheduler.num_workers} inference workers")
+        scheduler.start()
+        for station in stations:
+            station.start(scheduler)
+
+        start_time = time.time()
+        last_stats = start_time
+        while True:
+            now = time.time()
+            if duration is not None and now - start_time > duration:
+                break
+            if all(station.finished for station in stations):
+                break
+
+            for station in stations:
+                reps = station.reps
+                if reps != last_reps[station.station_id]:
+                    last_reps[station.station_id] = reps
+                    results.write({'event': 'rep', 'station': station.station_id,
+                                   'exercise': station.exercise, 'reps': reps})
+
+            if now - last_stats >= stats_interval:
+                last_stats = now
+                for station in stations:
+                    results.write({'event': 'stats', **station.stats()})
+
+            if headless:
+                time.sleep(0.05)
+                continue
+
+            labels = [
+                f"{stats['inference_fps']:.1f} fps, dropped {stats['dropped']}"
+                for stats in (station.stats() for station in stations)
+            ]
+            grid = tile_frames([station.display_frame for station in stations], labels)
+            cv2.imshow('Workout Tracker - Stations', grid)
+            if cv2.waitKey(30) & 0xFF == ord('q'):
+                break
+    finally:
+        for station in stations:
+            station.stop()
+        scheduler.stop()
+        for station in stations:
+            results.write({'event': 'final', **station.stats()})
+            station.close()
+        results.close()
+        if not headless:
+            cv2.destroyAllWindows()
+
+    return [station.stats() for station in stations]
@@ -0,0 +1,329 @@
+import logging
+from collections import namedtuple
+from enum import IntEnum
+
+import numpy as np
+
+logger = logging.getLogger(__name__)
+
+NUM_LANDMARKS = 33  # MediaPipe has 33 landmarks
+LANDMARK_FIELDS = 4  # x, y, z, visibility
+
+
+class PoseLandmark(IntEnum):
+    """Landmark indices shared by every backend, matching mp.solutions.pose.PoseLandmark"""
+    NOSE = 0
+    LEFT_EYE_INNER = 1
+    LEFT_EYE = 2
+    LEFT_EYE_OUTER = 3
+    RIGHT_EYE_INNER = 4
+    RIGHT_EYE = 5
+    RIGHT_EYE_OUTER = 6
+    LEFT_EAR = 7
+    RIGHT_EAR = 8
+    MOUTH_LEFT = 9
+    MOUTH_RIGHT = 10
+    LEFT_SHOULDER = 11
+    RIGHT_SHOULDER = 12
+    LEFT_ELBOW = 13
+    RIGHT_ELBOW = 14
+    LEFT_WRIST = 15
+    RIGHT_WRIST = 16
+    LEFT_PINKY = 17
+    RIGHT_PINKY = 18
+    LEFT_INDEX = 19
+    RIGHT_INDEX = 20
+    LEFT_THUMB = 21
+    RIGHT_THUMB = 22
+    LEFT_HIP = 23
+    RIGHT_HIP = 24
+    LEFT_KNEE = 25
+    RIGHT_KNEE = 26
+    LEFT_ANKLE = 27
+    RIGHT_ANKLE = 28
+    LEFT_HEEL = 29
+    RIGHT_HEEL = 30
+    LEFT_FOOT_INDEX = 31
+    RIGHT_FOOT_INDEX = 32
+
+
+# Lightweight stand-in for a MediaPipe landmark so the rep counters and
+# PoseOptimizer can keep using landmark.x / landmark.y / landmark.visibility
+Landmark = namedtuple('Landmark', ['x', 'y', 'z', 'visibility'])
+
+# Skeleton edges used for drawing, matching mp.solutions.pose.POSE_CONNECTIONS
+POSE_CONNECTIONS = (
+    (0, 1), (1, 2), (2, 3), (3, 7), (0, 4), (4, 5), (5, 6), (6, 8), (9, 10),
+    (11, 12), (11, 13), (13, 15), (15, 17), (15, 19), (15, 21), (17, 19),
+    (12, 14), (14, 16), (16, 18), (16, 20), (16, 22), (18, 20),
+    (11, 23), (12, 24), (23, 24), (23, 25), (24, 26), (25, 27), (26, 28),
+    (27, 29), (28, 30), (29, 31), (30, 32), (27, 31), (28, 32),
+)
+
+
+def landmarks_from_array(landmark_array):
+    """Convert a (33, 4) landmark array into a list of Landmark tuples"""
+    if landmark_array is None:
+        return None
+    return [Landmark(*map(float, row)) for row in landmark_array]
+
+
+def draw_landmarks(frame, landmark_array, point_color=(0, 0, 255), line_color=(0, 255, 0),
+                   visibility_threshold=0.5):
+    """Draw a (33, 4) landmark array onto a BGR frame in place.
+
+    Like MediaPipe's drawing_utils, landmarks below visibility_threshold and
+    the edges touching them are skipped, so occluded joints are not drawn.
+    """
+    import cv2
+
+    if landmark_array is None:
+        return frame
+
+    height, width = frame.shape[:2]
+    points = [(int(x * width), int(y * height)) for x, y in landmark_array[:, :2]]
+    visible = landmark_array[:, 3] >= visibility_threshold
+
+    for start, end in POSE_CONNECTIONS:
+        if visible[start] and visible[end]:
+            cv2.line(frame, points[start], points[end], line_color, 2)
+    for point, is_visible in zip(points, visible):
+        if is_visible:
+            cv2.circle(frame, point, 2, point_color, 2)
+
+    return frame
+
+
+class PoseEstimator:
+    """Base class for pose estimation backends.
+
+    Subclasses implement estimate(), which takes an RGB image and returns a
+    float32 array of shape (33, 4) holding normalized x, y, z and visibility
+    for each MediaPipe landmark, or None when no pose is detected.
+    """
+
+    name = 'base'
+    uses_model_path = False  # Whether the backend loads a model file given as model_path
+    reads_image = True  # Whether the output depends on the image passed to estimate()
+
+    def estimate(self, image_rgb):
+        raise NotImplementedError
+
+    def close(self):
+        """Release any resources held by the backend"""
+        pass
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, exc_value, traceback):
+        self.close()
+
+
+class MediaPipeEstimator(PoseEstimator):
+    """Pose estimation with mp.solutions.pose.Pose"""
+
+    name = 'mediapipe'
+
+    def __init__(self, static_image_mode=False, model_complexity=1,
+                 min_detection_confidence=0.5, min_tracking_confidence=0.5):
+        import mediapipe as mp
+
+        self.pose = mp.solutions.pose.Pose(
+            static_image_mode=static_image_mode,
+            model_complexity=model_complexity,
+            min_detection_confidence=min_detection_confidence,
+            min_tracking_confidence=min_tracking_confidence
+        )
+
+    def estimate(self, image_rgb):
+        results = self.pose.process(image_rgb)
+        if not results.pose_landmarks:
+            return None
+
+        return np.array(
+            [(lm.x, lm.y, lm.z, lm.visibility) for lm in results.pose_landmarks.landmark],
+            dtype=np.float32
+        )
+
+    def close(self):
+        self.pose.close()
+
+
+class OnnxEstimator(PoseEstimator):
+    """Pose estimation with a locally stored ONNX model on the CPU.
+
+    The model must take a single image input (NHWC or NCHW, float in [0, 1])
+    and produce a first output that reshapes to (N, >=4) with N >= 33, where
+    the first four values per landmark are x, y, z in input pixels and a
+    visibility logit. This matches the BlazePose landmark models exported to
+    ONNX. The full frame is letterboxed to the model input, so the person
+    should fill most of the view.
+
+    Frames without a person return None. The decision uses the model's
+    single-value pose presence output when it has one (BlazePose exports it
+    second), otherwise the mean landmark visibility.
+    """
+
+    name = 'onnx'
+    uses_model_path = True
+
+    def __init__(self, model_path=None, num_threads=None, min_presence=0.5, min_visibility=0.5):
+        if not model_path:
+            raise ValueError("The onnx backend requires a model path")
+
+        try:
+            import onnxruntime as ort
+        except ImportError as e:
+            raise RuntimeError("The onnx backend requires the onnxruntime package") from e
+
+        options = ort.SessionOptions()
+        if num_threads:
+            options.intra_op_num_threads = num_threads
+        self.session = ort.InferenceSession(
+            model_path, sess_options=options, providers=['CPUExecutionProvider']
+        )
+
+        self.min_presence = min_presence
+        self.min_visibility = min_visibility
+        # Index of a single-value pose presence output, if the model has one
+        self.presence_index = next(
+            (i for i, output in enumerate(self.session.get_outputs())
+             if i > 0 and np.prod([d if isinstance(d, int) else 1 for d in output.shape]) == 1),
+            None
+        )
+
+        model_input = self.session.get_inputs()[0]
+        self.input_name = model_input.name
+        shape = model_input.shape
+        self.channels_first = shape[1] == 3
+        if self.channels_first:
+            self.input_height, self.input_width = shape[2], shape[3]
+        else:
+            self.input_height, self.input_width = shape[1], shape[2]
+
+    def _preprocess(self, image_rgb):
+        """Letterbox the image to the model input size"""
+        import cv2
+
+        height, width = image_rgb.shape[:2]
+        scale = min(self.input_width / width, self.input_height / height)
+        resized_w, resized_h = int(width * scale), int(height * scale)
+        pad_x = (self.input_width - resized_w) // 2
+        pad_y = (self.input_height - resized_h) // 2
+
+        canvas = np.zeros((self.input_height, self.input_width, 3), dtype=np.float32)
+        resized = cv2.resize(image_rgb, (resized_w, resized_h))
+        canvas[pad_y:pad_y + resized_h, pad_x:pad_x + resized_w] = resized / 255.0
+
+        if self.channels_first:
+            canvas = canvas.transpose(2, 0, 1)
+        return canvas[np.newaxis], (scale, pad_x, pad_y, width, height)
+
+    def estimate(self, image_rgb):
+        tensor, (scale, pad_x, pad_y, width, height) = self._preprocess(image_rgb)
+        outputs = self.session.run(None, {self.input_name: tensor})
+
+        if self.presence_index is not None:
+            presence = float(np.asarray(outputs[self.presence_index]).reshape(-1)[0])
+            if not 0.0 <= presence <= 1.0:
+                presence = 1.0 / (1.0 + np.exp(-presence))  # Exported as a logit
+            if presence < self.min_presence:
+                return None
+
+        raw = np.asarray(outputs[0], dtype=np.float32).reshape(-1)
+        # BlazePose exports 5 values per landmark (with presence), others 4
+        stride = next(
+            (s for s in (5, 4) if raw.size % s == 0 and raw.size // s >= NUM_LANDMARKS),
+            None
+        )
+        if stride is None:
+            raise RuntimeError(f"Unexpected ONNX pose output size: {raw.size}")
+        raw = raw.reshape(-1, stride)[:NUM_LANDMARKS, :LANDMARK_FIELDS]
+
+        landmarks = np.empty((NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+        # Undo the letterbox and normalize to the original frame
+        landmarks[:, 0] = (raw[:, 0] - pad_x) / scale / width
+        landmarks[:, 1] = (raw[:, 1] - pad_y) / scale / height
+        landmarks[:, 2] = raw[:, 2] / scale / width
+        landmarks[:, 3] = 1.0 / (1.0 + np.exp(-raw[:, 3]))
+
+        if self.presence_index is None and landmarks[:, 3].mean() < self.min_visibility:
+            return None
+        return landmarks
+
+
+# Normalized standing pose used as the base of the synthetic backend
+_STANDING_POSE = np.array([
+    (0.50, 0.10), (0.51, 0.09), (0.52, 0.09), (0.53, 0.09), (0.49, 0.09),
+    (0.48, 0.09), (0.47, 0.09), (0.55, 0.10), (0.45, 0.10), (0.51, 0.12),
+    (0.49, 0.12), (0.58, 0.22), (0.42, 0.22), (0.60, 0.35), (0.40, 0.35),
+    (0.61, 0.47), (0.39, 0.47), (0.62, 0.50), (0.38, 0.50), (0.61, 0.50),
+    (0.39, 0.50), (0.60, 0.49), (0.40, 0.49), (0.55, 0.50), (0.45, 0.50),
+    (0.55, 0.68), (0.45, 0.68), (0.55, 0.86), (0.45, 0.86), (0.55, 0.88),
+    (0.45, 0.88), (0.57, 0.92), (0.43, 0.92),
+], dtype=np.float32)
+
+# Landmarks that dip with the hips during the synthetic squat motion
+_UPPER_BODY = np.arange(0, 25)
+_HIPS = np.array([23, 24])
+
+
+class SyntheticEstimator(PoseEstimator):
+    """Deterministic landmark generator for tests and load benchmarks.
+
+    Ignores the image content and returns a squat-like motion driven by the
+    call count, with seeded jitter, so runs are reproducible without a camera
+    or model files.
+    """
+
+    name = 'synthetic'
+    reads_image = False
+
+    def __init__(self, seed=0, period=30, depth=0.15, noise=0.002):
+        self.seed = seed
+        self.period = period
+        self.depth = depth
+        self.noise = noise
+        self.reset()
+
+    def reset(self):
+        """Restart the motion sequence from the first frame"""
+        self.frame_index = 0
+        self.rng = np.random.default_rng(self.seed)
+
+    def estimate(self, image_rgb=None):
+        phase = (1 - np.cos(2 * np.pi * self.frame_index / self.period)) / 2
+        self.frame_index += 1
+
+        landmarks = np.empty((NUM_LANDMARKS, LANDMARK_FIELDS), dtype=np.float32)
+        landmarks[:, :2] = _STANDING_POSE
+        landmarks[_UPPER_BODY, 1] += self.depth * phase
+        landmarks[_HIPS, 1] += 0.1 * phase  # Hips drop towards the knees
+        landmarks[:, :2] += self.rng.normal(0, self.noise, (NUM_LANDMARKS, 2))
+        landmarks[:, 2] = 0.0
+        landmarks[:, 3] = 0.99
+        return landmarks
+
+
+ESTIMATOR_BACKENDS = {
+    MediaPipeEstimator.name: MediaPipeEstimator,
+    OnnxEstimator.name: OnnxEstimator,
+    SyntheticEstimator.name: SyntheticEstimator,
+}
+
+
+def create_estimator(backend='mediapipe', model_path=None, **kwargs):
+    """Create a pose estimator by backend name.
+
+    model_path is passed on to backends that load a model file and ignored by the rest.
+    """
+    backend = backend.lower()
+    if backend not in ESTIMATOR_BACKENDS:
+        raise ValueError(
+            f"Unknown pose backend: {backend}. Choose from: {', '.join(ESTIMATOR_BACKENDS)}"
+        )
+    estimator_class = ESTIMATOR_BACKENDS[backend]
+    if estimator_class.uses_model_path:
+        kwargs['model_path'] = model_path
+    return estimator_class(**kwargs)
@@ -1,5 +1,4 @@
 import numpy as np
-import mediapipe as mp
 
 class PoseOptimizer:
     def __init__(self):
@@ -7,7 +6,6 @@ class PoseOptimizer:
         self.frame_skip_counter = 0
         self.movement_threshold_high = 0.05  # Threshold for high movement
         self.movement_threshold_low = 0.02   # Threshold for low movement
-        self.mp_pose = mp.solutions.pose
 
     def calculate_movement_score(self, current_landmarks):
         """Calculate the movement score between current and previous landmarks"""
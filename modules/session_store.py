@@ -0,0 +1,119 @@
+import logging
+import threading
+import time
+from collections import OrderedDict
+
+from modules.exercise_counter import ExerciseCounter
+from modules.memory_accounting import deep_sizeof
+from modules.pose_optimizer import PoseOptimizer
+
+logger = logging.getLogger(__name__)
+
+
+class Session:
+    """Per-user tracking state: rep counters, frame optimizer and exercise state"""
+
+    def __init__(self, session_id):
+        self.session_id = session_id
+        self.counter = ExerciseCounter()
+        self.pose_optimizer = PoseOptimizer()
+        self.last_exercise = None
+        self.exercise_state = {}
+        self.frames = 0
+        self.created = time.time()
+        self.last_seen = self.created
+
+    def switch_exercise(self, exercise):
+        """Reset state when the exercise changes"""
+        logger.info(f"Session {self.session_id}: exercise changed from {self.last_exercise} "
+                    f"to {exercise}. Resetting state.")
+        self.last_exercise = exercise
+        self.exercise_state = {}
+        self.counter.reset()
+        self.pose_optimizer.prev_landmarks = None
+        self.pose_optimizer.adjust_thresholds(exercise)
+
+
+class SessionStore:
+    """LRU store of sessions with per-session and global memory ceilings.
+
+    Sizes are re-measured whenever a session is updated. A session that grows
+    past session_limit_bytes is evicted, and least recently used sessions are
+    evicted while the total exceeds total_limit_bytes or the count exceeds
+    max_sessions. Evicted sessions start fresh on their next request.
+    """
+
+    def __init__(self, session_limit_bytes=None, total_limit_bytes=None, max_sessions=None):
+        self.session_limit_bytes = session_limit_bytes
+        self.total_limit_bytes = total_limit_bytes
+        self.max_sessions = max_sessions
+
+        self.lock = threading.RLock()
+        self.sessions = OrderedDict()
+        self.sizes = {}
+        self.evictions = 0
+
+    def get(self, session_id):
+        """Return the session for an id, creating it if needed, and mark it most recently used"""
+        with self.lock:
+            session = self.sessions.get(session_id)
+            if session is None:
+                session = Session(session_id)
+                self.sessions[session_id] = session
+                self.sizes[session_id] = deep_sizeof(session)
+            else:
+                self.sessions.move_to_end(session_id)
+            session.last_seen = time.time()
+            return session
+
+    def update(self, session):
+        """Re-measure a session after it changed and enforce the memory ceilings"""
+        with self.lock:
+            if session.session_id not in self.sessions:
+                return  # Evicted while the request was in flight
+            size = deep_sizeof(session)
+            self.sizes[session.session_id] = size
+
+            if self.session_limit_bytes and size > self.session_limit_bytes:
+                logger.warning(f"Session {session.session_id} uses {size} bytes, over the "
+                               f"{self.session_limit_bytes} byte limit. Evicting.")
+                self.evict(session.session_id)
+
+            while self.sessions and (
+                (self.total_limit_bytes and self.total_bytes() > self.total_limit_bytes) or
+                (self.max_sessions and len(self.sessions) > self.max_sessions)
+            ):
+                self.evict(next(iter(self.sessions)))
+
+    def evict(self, session_id):
+        with self.lock:
+            if self.sessions.pop(session_id, None) is not None:
+                self.sizes.pop(session_id, None)
+                self.evictions += 1
+                logger.info(f"Evicted session {session_id}")
+
+    def total_bytes(self):
+        with self.lock:
+            return sum(self.sizes.values())
+
+    def report(self, top=10):
+        """Memory summary with the largest sessions"""
+        with self.lock:
+            largest = sorted(self.sizes.items(), key=lambda item: item[1], reverse=True)[:top]
+            return {
+                'count': len(self.sessions),
+                'total_bytes': self.total_bytes(),
+                'evictions': self.evictions,
+                'session_limit_bytes': self.session_limit_bytes,
+                'total_limit_bytes': self.total_limit_bytes,
+                'max_sessions': self.max_sessions,
+                'largest': [
+                    {
+                        'session_id': session_id,
+                        'bytes': size,
+                        'frames': self.sessions[session_id].frames,
+                        'idle_seconds': round(time.time() - self.sessions[session_id].last_seen, 1)
+                    }
+                    for session_id, size in largest
+                ]
+            }
@@ -1,23 +1,20 @@
-import mediapipe as mp
+from modules.pose_estimators import PoseLandmark
 import numpy as np
 import logging
 
 # Set up logging
 logger = logging.getLogger(__name__)
 
-mp_pose = mp.solutions.pose
-pose = mp_pose.Pose()
-
 alignment_tolerance = 0.1  # Adjust as necessary
 squat_depth_threshold = 0.15  # Threshold for squat depth (adjust as needed)
 squat_in_progress = False  # Global variable for squat state
 debug_counter = 0  # Counter for periodic logging
 
 def check_squat_conditions(landmarks):
-    hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-    knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value]
-    ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
-    foot_index = landmarks[mp_pose.PoseLandmark.LEFT_FOOT_INDEX.value]
+    hip = landmarks[PoseLandmark.LEFT_HIP.value]
+    knee = landmarks[PoseLandmark.LEFT_KNEE.value]
+    ankle = landmarks[PoseLandmark.LEFT_ANKLE.value]
+    foot_index = landmarks[PoseLandmark.LEFT_FOOT_INDEX.value]
 
     # Calculate hip to knee height ratio for squat depth
     standing_height = hip.y
@@ -41,10 +38,10 @@ def check_squat_conditions(landmarks):
 
 def is_initial_standing(landmarks):
     """Check if the person is in a standing position"""
-    shoulder = landmarks[mp_pose.PoseLandmark.LEFT_SHOULDER.value]
-    hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-    knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value]
-    ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
+    shoulder = landmarks[PoseLandmark.LEFT_SHOULDER.value]
+    hip = landmarks[PoseLandmark.LEFT_HIP.value]
+    knee = landmarks[PoseLandmark.LEFT_KNEE.value]
+    ankle = landmarks[PoseLandmark.LEFT_ANKLE.value]
 
     # Check vertical alignment of body
     vertical_alignment = (abs(shoulder.x - hip.x) < alignment_tolerance and
@@ -73,9 +70,9 @@ def count_squats(landmarks):
     is_squatting, good_form = check_squat_conditions(landmarks)
 
     # Get key positions for debugging
-    hip = landmarks[mp_pose.PoseLandmark.LEFT_HIP.value]
-    knee = landmarks[mp_pose.PoseLandmark.LEFT_KNEE.value] 
-    ankle = landmarks[mp_pose.PoseLandmark.LEFT_ANKLE.value]
+    hip = landmarks[PoseLandmark.LEFT_HIP.value]
+    knee = landmarks[PoseLandmark.LEFT_KNEE.value] 
+    ankle = landmarks[PoseLandmark.LEFT_ANKLE.value]
     
     # Log the current state periodically
     global debug_counter
@@ -0,0 +1,399 @@
+import csv
+import hashlib
+import logging
+import os
+import sqlite3
+import threading
+import time
+from datetime import date, datetime, timedelta, timezone
+
+logger = logging.getLogger(__name__)
+
+DEFAULT_DB_PATH = os.path.join(os.path.dirname(os.path.dirname(os.path.abspath(__file__))),
+                               'workout_history.db')
+
+MAX_PAGE_SIZE = 100
+MAX_ROLLUP_DAYS = 366
+MAX_UTC_OFFSET_MINUTES = 14 * 60
+MAX_TIMESTAMP = 32503680000.0  # 3000-01-01 UTC, far inside what datetime can represent
+
+SCHEMA = """
+CREATE TABLE IF NOT EXISTS cycles (
+    id INTEGER PRIMARY KEY,
+    user_id TEXT NOT NULL,
+    completed_at REAL NOT NULL,
+    day TEXT NOT NULL,
+    set_number INTEGER NOT NULL,
+    exercise TEXT NOT NULL,
+    reps INTEGER NOT NULL,
+    source TEXT NOT NULL DEFAULT 'live',
+    import_key TEXT
+);
+CREATE INDEX IF NOT EXISTS idx_cycles_user_time ON cycles (user_id, completed_at);
+-- Imported rows carry a key so importing the same file twice is a no-op
+CREATE UNIQUE INDEX IF NOT EXISTS idx_cycles_import ON cycles (user_id, import_key);
+
+CREATE TABLE IF NOT EXISTS daily_rollups (
+    user_id TEXT NOT NULL,
+    day TEXT NOT NULL,
+    exercise TEXT NOT NULL,
+    total_reps INTEGER NOT NULL,
+    cycles INTEGER NOT NULL,
+    best_set INTEGER NOT NULL,
+    PRIMARY KEY (user_id, day, exercise)
+);
+
+CREATE TABLE IF NOT EXISTS weekly_rollups (
+    user_id TEXT NOT NULL,
+    week TEXT NOT NULL,
+    exercise TEXT NOT NULL,
+    total_reps INTEGER NOT NULL,
+    cycles INTEGER NOT NULL,
+    best_set INTEGER NOT NULL,
+    PRIMARY KEY (user_id, week, exercise)
+);
+
+CREATE TABLE IF NOT EXISTS exercise_totals (
+    user_id TEXT NOT NULL,
+    exercise TEXT NOT NULL,
+    total_reps INTEGER NOT NULL,
+    cycles INTEGER NOT NULL,
+    best_set INTEGER NOT NULL,
+    best_set_at REAL NOT NULL,
+    PRIMARY KEY (user_id, exercise)
+);
+
+CREATE TABLE IF NOT EXISTS streaks (
+    user_id TEXT PRIMARY KEY,
+    current_streak INTEGER NOT NULL,
+    longest_streak INTEGER NOT NULL,
+    last_day TEXT NOT NULL
+);
+"""
+
+
+def local_date(timestamp, utc_offset_minutes=None):
+    """Calendar date of a timestamp at a UTC offset, or in server-local time if None"""
+    if utc_offset_minutes is None:
+        return datetime.fromtimestamp(timestamp).date()
+    if isinstance(utc_offset_minutes, bool) or not isinstance(utc_offset_minutes, int):
+        raise ValueError(f"Invalid UTC offset: {utc_offset_minutes!r}. Use whole minutes")
+    if abs(utc_offset_minutes) > MAX_UTC_OFFSET_MINUTES:
+        raise ValueError(f"Invalid UTC offset: {utc_offset_minutes} minutes")
+    return datetime.fromtimestamp(timestamp, timezone(timedelta(minutes=utc_offset_minutes))).date()
+
+
+def week_key(day):
+    year, week, _ = day.isocalendar()
+    return f'{year}-W{week:02d}'
+
+
+def parse_timestamp(value):
+    """Parse a Unix timestamp in seconds, raising ValueError if it is not a finite, in-range number"""
+    if isinstance(value, bool):
+        raise ValueError(f"Invalid timestamp: {value}")
+    try:
+        timestamp = float(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid timestamp: {value}")
+    # Also rejects NaN and infinity
+    if not 0 <= timestamp <= MAX_TIMESTAMP:
+        raise ValueError(f"Timestamp out of range: {value}")
+    return timestamp
+
+
+def parse_day(value):
+    """Parse a YYYY-MM-DD query value, raising ValueError on bad input"""
+    try:
+        return date.fromisoformat(value)
+    except (TypeError, ValueError):
+        raise ValueError(f"Invalid date: {value}. Use YYYY-MM-DD")
+
+
+class WorkoutHistory:
+    """Indexed SQLite store of completed cycles with incrementally maintained rollups.
+
+    Every recorded cycle updates the daily and weekly totals, per-exercise
+    totals and best sets, and the user's streak in the same transaction, so
+    reads never scan the raw cycle history.
+
+    Days and weeks follow the client's UTC offset when one is given with the
+    cycle, and the server's local time otherwise.
+    """
+
+    def __init__(self, db_path=DEFAULT_DB_PATH):
+        self.db_path = db_path
+        self.lock = threading.Lock()
+        self.conn = sqlite3.connect(db_path, check_same_thread=False)
+        self.conn.row_factory = sqlite3.Row
+        self.conn.execute('PRAGMA journal_mode=WAL')
+        self.conn.executescript(SCHEMA)
+
+    def close(self):
+        self.conn.close()
+
+    def cache_bytes(self):
+        """Upper bound on the connection's page cache: its size limit, or the whole database if smaller"""
+        with self.lock:
+            page_size = self.conn.execute('PRAGMA page_size').fetchone()[0]
+            page_count = self.conn.execute('PRAGMA page_count').fetchone()[0]
+            cache_size = self.conn.execute('PRAGMA cache_size').fetchone()[0]
+        # A negative cache_size is a limit in KiB rather than in pages
+        limit = -cache_size * 1024 if cache_size < 0 else cache_size * page_size
+        return min(limit, page_count * page_size)
+
+    def record_cycle(self, user_id, exercise, reps, set_number=1, completed_at=None,
+                     source='live', utc_offset_minutes=None):
+        """Store a completed cycle and update all rollups"""
+        return self.record_cycles(user_id, [{
+            'exercise': exercise,
+            'reps': reps,
+            'set_number': set_number,
+            'completed_at': completed_at
+        }], source=source, utc_offset_minutes=utc_offset_minutes)[0]
+
+    def record_cycles(self, user_id, cycles, source='live', utc_offset_minutes=None):
+        """Store several completed cycles in one transaction, returning their ids.
+
+        Cycles may carry an import_key; a cycle whose key was already stored
+        for the user is skipped without touching the rollups, and its id is None.
+        """
+        ids = []
+        with self.lock, self.conn:
+            backfilled = False
+            for cycle in cycles:
+                completed_at = cycle.get('completed_at')
+                cycle_id, cycle_backfilled = self._insert_cycle(
+                    user_id,
+                    cycle['exercise'],
+                    int(cycle['reps']),
+                    int(cycle.get('set_number') or 1),
+                    time.time() if completed_at is None else parse_timestamp(completed_at),
+                    source,
+                    cycle.get('import_key'),
+                    utc_offset_minutes
+                )
+                ids.append(cycle_id)
+                backfilled = backfilled or cycle_backfilled
+
+            # Cycles older than the streak's last day need a full rebuild, done once per batch
+            if backfilled:
+                self._write_streak(user_id, *self._rebuild_streak(user_id))
+        return ids
+
+    def _insert_cycle(self, user_id, exercise, reps, set_number, completed_at, source,
+                      import_key, utc_offset_minutes):
+        """Insert one cycle and update its rollups. Returns (id, whether the streak needs a rebuild)"""
+        if reps < 0:
+            raise ValueError("reps must not be negative")
+
+        cycle_day = local_date(completed_at, utc_offset_minutes)
+        day = cycle_day.isoformat()
+        cursor = self.conn.execute(
+            'INSERT INTO cycles (user_id, completed_at, day, set_number, exercise, reps, source, import_key) '
+            'VALUES (?, ?, ?, ?, ?, ?, ?, ?) ON CONFLICT DO NOTHING',
+            (user_id, completed_at, day, set_number, exercise, reps, source, import_key)
+        )
+        if cursor.rowcount == 0:
+            return None, False  # Already imported
+
+        for table, column, key in (('daily_rollups', 'day', day),
+                                   ('weekly_rollups', 'week', week_key(cycle_day))):
+            self.conn.execute(
+                f'INSERT INTO {table} (user_id, {column}, exercise, total_reps, cycles, best_set) '
+                f'VALUES (?, ?, ?, ?, 1, ?) '
+                f'ON CONFLICT (user_id, {column}, exercise) DO UPDATE SET '
+                f'total_reps = total_reps + excluded.total_reps, cycles = cycles + 1, '
+                f'best_set = MAX(best_set, excluded.best_set)',
+                (user_id, key, exercise, reps, reps)
+            )
+
+        self.conn.execute(
+            'INSERT INTO exercise_totals (user_id, exercise, total_reps, cycles, best_set, best_set_at) '
+            'VALUES (?, ?, ?, 1, ?, ?) '
+            'ON CONFLICT (user_id, exercise) DO UPDATE SET '
+            'total_reps = total_reps + excluded.total_reps, cycles = cycles + 1, '
+            'best_set_at = CASE WHEN excluded.best_set > best_set THEN excluded.best_set_at ELSE best_set_at END, '
+            'best_set = MAX(best_set, excluded.best_set)',
+            (user_id, exercise, reps, reps, completed_at)
+        )
+
+        return cursor.lastrowid, self._update_streak(user_id, day)
+
+    def _update_streak(self, user_id, day):
+        """Extend or reset the streak for a new day. Returns True if the day is a backfill"""
+        row = self.conn.execute(
+            'SELECT current_streak, longest_streak, last_day FROM streaks WHERE user_id = ?',
+            (user_id,)
+        ).fetchone()
+
+        if row is None:
+            current, longest = 1, 1
+            last_day = day
+        elif day == row['last_day']:
+            return False
+        elif day > row['last_day']:
+            gap = (date.fromisoformat(day) - date.fromisoformat(row['last_day'])).days
+            current = row['current_streak'] + 1 if gap == 1 else 1
+            longest = max(row['longest_streak'], current)
+            last_day = day
+        else:
+            return True
+
+        self._write_streak(user_id, current, longest, last_day)
+        return False
+
+    def _write_streak(self, user_id, current, longest, last_day):
+        self.conn.execute(
+            'INSERT INTO streaks (user_id, current_streak, longest_streak, last_day) VALUES (?, ?, ?, ?) '
+            'ON CONFLICT (user_id) DO UPDATE SET current_streak = excluded.current_streak, '
+            'longest_streak = excluded.longest_streak, last_day = excluded.last_day',
+            (user_id, current, longest, last_day)
+        )
+
+    def _rebuild_streak(self, user_id):
+        days = [date.fromisoformat(r[0]) for r in self.conn.execute(
+            'SELECT DISTINCT day FROM daily_rollups WHERE user_id = ? ORDER BY day', (user_id,)
+        )]
+        current = longest = 0
+        previous = None
+        for day in days:
+            current = current + 1 if previous and (day - previous).days == 1 else 1
+            longest = max(longest, current)
+            previous = day
+        return current, longest, days[-1].isoformat()
+
+    def list_cycles(self, user_id, start=None, end=None, limit=20, cursor=None):
+        """Page through cycles newest first within an optional [start, end) timestamp range.
+
+        Uses keyset pagination: pass the returned next_cursor to get the next page.
+        """
+        limit = max(1, min(int(limit), MAX_PAGE_SIZE))
+        query = 'SELECT id, completed_at, day, set_number, exercise, reps, source FROM cycles WHERE user_id = ?'
+        params = [user_id]
+
+        if start is not None:
+            query += ' AND completed_at >= ?'
+            params.append(float(start))
+        if end is not None:
+            query += ' AND completed_at < ?'
+            params.append(float(end))
+        if cursor:
+            try:
+                cursor_time, cursor_id = cursor.split(':')
+                cursor_time, cursor_id = float(cursor_time), int(cursor_id)
+            except ValueError:
+                raise ValueError(f"Invalid cursor: {cursor}")
+            query += ' AND (completed_at < ? OR (completed_at = ? AND id < ?))'
+            params.extend([cursor_time, cursor_time, cursor_id])
+
+        query += ' ORDER BY completed_at DESC, id DESC LIMIT ?'
+        params.append(limit + 1)
+
+        with self.lock:
+            rows = [dict(row) for row in self.conn.execute(query, params)]
+
+        next_cursor = None
+        if len(rows) > limit:
+            rows = rows[:limit]
+            next_cursor = f"{rows[-1]['completed_at']!r}:{rows[-1]['id']}"
+        return {'cycles': rows, 'next_cursor': next_cursor}
+
+    def rollups(self, user_id, period='day', start_day=None, end_day=None, exercise=None,
+                utc_offset_minutes=None):
+        """Precomputed per-day or per-week totals for each exercise in an inclusive day range.
+
+        The range defaults to the 30 days ending today at the given UTC offset.
+        """
+        if period not in ('day', 'week'):
+            raise ValueError(f"Invalid period: {period}. Use day or week")
+
+        end = parse_day(end_day) if end_day else local_date(time.time(), utc_offset_minutes)
+        start = parse_day(start_day) if start_day else end - timedelta(days=29)
+        if start > end:
+            raise ValueError("start must not be after end")
+        if (end - start).days >= MAX_ROLLUP_DAYS:
+            raise ValueError(f"Range is limited to {MAX_ROLLUP_DAYS} days")
+
+        if period == 'day':
+            table, column = 'daily_rollups', 'day'
+            low, high = start.isoformat(), end.isoformat()
+        else:
+            table, column = 'weekly_rollups', 'week'
+            low, high = week_key(start), week_key(end)
+
+        query = (f'SELECT {column} AS period, exercise, total_reps, cycles, best_set FROM {table} '
+                 f'WHERE user_id = ? AND {column} BETWEEN ? AND ?')
+        params = [user_id, low, high]
+        if exercise:
+            query += ' AND exercise = ?'
+            params.append(exercise)
+        query += f' ORDER BY {column}, exercise'
+
+        with self.lock:
+            rows = [dict(row) for row in self.conn.execute(query, params)]
+        return {'period': period, 'start': start.isoformat(), 'end': end.isoformat(), 'rollups': rows}
+
+    def summary(self, user_id, utc_offset_minutes=None):
+        """All-time totals, best sets and streaks for a user, with today taken at the given UTC offset"""
+        today = local_date(time.time(), utc_offset_minutes)
+        with self.lock:
+            exercises = [dict(row) for row in self.conn.execute(
+                'SELECT exercise, total_reps, cycles, best_set, best_set_at FROM exercise_totals '
+                'WHERE user_id = ? ORDER BY exercise', (user_id,)
+            )]
+            streak = self.conn.execute(
+                'SELECT current_streak, longest_streak, last_day FROM streaks WHERE user_id = ?',
+                (user_id,)
+            ).fetchone()
+
+        current = 0
+        if streak is not None:
+            # A streak is only still active if the last workout was today or yesterday
+            days_since = (today - date.fromisoformat(streak['last_day'])).days
+            current = streak['current_streak'] if days_since <= 1 else 0
+
+        return {
+            'exercises': exercises,
+            'total_reps': sum(e['total_reps'] for e in exercises),
+            'total_cycles': sum(e['cycles'] for e in exercises),
+            'current_streak': current,
+            'longest_streak': streak['longest_streak'] if streak else 0,
+            'last_workout_day': streak['last_day'] if streak else None
+        }
+
+    def import_csv(self, path, user_id, completed_at=None):
+        """Import a workout_data.csv written by main.py (Set Number, Exercise, Reps).
+
+        The CSV has no timestamps, so every row is dated completed_at, falling
+        back to the file's modification time. Rows are keyed by the file's
+        content hash, that time and the row index, so re-importing the same
+        workout (even from another path) skips rows already stored, while a
+        later workout that happens to write an identical file is still
+        imported. Returns (imported, skipped).
+        """
+        if completed_at is None:
+            completed_at = os.path.getmtime(path)
+
+        with open(path, 'rb') as f:
+            digest = hashlib.sha256(f.read()).hexdigest()
+
+        with open(path, newline='') as f:
+            cycles = [
+                {
+                    'exercise': row['Exercise'].strip().lower(),
+                    'reps': int(row['Reps']),
+                    'set_number': int(row['Set Number']),
+                    # Keep rows in file order within the same workout
+                    'completed_at': completed_at + index * 1e-3,
+                    'import_key': f'csv:{digest}:{completed_at!r}:{index}'
+                }
+                for index, row in enumerate(csv.DictReader(f))
+            ]
+
+        ids = self.record_cycles(user_id, cycles, source='csv')
+        imported = sum(cycle_id is not None for cycle_id in ids)
+        skipped = len(ids) - imported
+        logger.info(f"Imported {imported} cycles from {path} for user {user_id}, "
+                    f"skipped {skipped} already imported")
+        return imported, skipped
@@ -1,8 +1,29 @@
-import { ExerciseType } from './types';
+import { ExerciseType, HistoryCycle, HistorySummary, WorkoutResults } from './types';
 
 // API base URL - change to your backend server address
 const API_BASE_URL = 'http://127.0.0.1:5000';
 
+/**
+ * Get an id for this browser tab so the backend keeps separate rep counters per client
+ */
+function getSessionId(): string {
+  const key = 'poseSessionId';
+  let sessionId = sessionStorage.getItem(key);
+  if (!sessionId) {
+    sessionId = `${Date.now().toString(36)}-${Math.random().toString(36).slice(2, 10)}`;
+    sessionStorage.setItem(key, sessionId);
+  }
+  return sessionId;
+}
+
+/**
+ * Minutes this browser's local time is ahead of UTC, so the backend groups
+ * history days and streaks by the user's calendar instead of the server's
+ */
+function getUtcOffsetMinutes(): number {
+  return -new Date().getTimezoneOffset();
+}
+
 /**
  * Process a video frame with the MediaPipe backend
  * @param imageData Canvas image data 
@@ -43,6 +64,7 @@ export async function processFrame(
       body: JSON.stringify({
         image: imageDataUrl,
         exercise: exerciseType,
+        sessionId: getSessionId(),
       }),
     });
     
@@ -118,4 +140,70 @@ export function getWorkoutHistory(): Promise<{
       resolve([]);
     }
   });
-} 
\ No newline at end of file
+} 
+
+/**
+ * Record a completed cycle in the backend workout history
+ * The backend updates its daily/weekly rollups, best sets and streaks on write
+ */
+export async function recordWorkoutCycle(
+  userId: string,
+  result: WorkoutResults
+): Promise<boolean> {
+  try {
+    const response = await fetch(`${API_BASE_URL}/api/history/cycles`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+      },
+      body: JSON.stringify({
+        userId,
+        exercise: result.exercise,
+        reps: result.reps,
+        setNumber: result.setNumber,
+        utcOffsetMinutes: getUtcOffsetMinutes(),
+      }),
+    });
+    
+    if (!response.ok) {
+      throw new Error(`Server responded with status: ${response.status}`);
+    }
+    return true;
+  } catch (error) {
+    console.error('Error recording workout cycle:', error);
+    return false;
+  }
+}
+
+/**
+ * Get a page of completed cycles from the backend history, newest first
+ * Pass the returned nextCursor to fetch the following page
+ */
+export async function getHistoryCycles(
+  userId: string,
+  options: { start?: number; end?: number; limit?: number; cursor?: string } = {}
+): Promise<{ cycles: HistoryCycle[]; nextCursor: string | null }> {
+  const params = new URLSearchParams({ userId });
+  Object.entries(options).forEach(([key, value]) => {
+    if (value !== undefined) params.set(key, String(value));
+  });
+  
+  const response = await fetch(`${API_BASE_URL}/api/history/cycles?${params}`);
+  if (!response.ok) {
+    throw new Error(`Server responded with status: ${response.status}`);
+  }
+  const result = await response.json();
+  return { cycles: result.cycles, nextCursor: result.next_cursor };
+}
+
+/**
+ * Get all-time totals, best sets and streaks from the backend history
+ */
+export async function getHistorySummary(userId: string): Promise<HistorySummary> {
+  const params = new URLSearchParams({ userId, utcOffset: String(getUtcOffsetMinutes()) });
+  const response = await fetch(`${API_BASE_URL}/api/history/summary?${params}`);
+  if (!response.ok) {
+    throw new Error(`Server responded with status: ${response.status}`);
+  }
+  return response.json();
+}
@@ -37,6 +37,26 @@ export interface WorkoutResults {
   caloriesBurned?: number;
 }
 
+// Completed cycle stored by the backend workout history
+export interface HistoryCycle {
+  id: number;
+  completed_at: number;  // Unix seconds
+  day: string;           // YYYY-MM-DD
+  set_number: number;
+  exercise: string;
+  reps: number;
+}
+
+// All-time totals and streaks from the backend workout history
+export interface HistorySummary {
+  exercises: { exercise: string; total_reps: number; cycles: number; best_set: number; best_set_at: number }[];
+  total_reps: number;
+  total_cycles: number;
+  current_streak: number;
+  longest_streak: number;
+  last_workout_day: string | null;
+}
+
 export type ExerciseType = 'burpees' | 'squats' | 'high_knees' | 'mountain_climbers' | 'jumping_jacks' | 'workout_end';
 
 export const EXERCISE_TYPES: ExerciseType[] = [
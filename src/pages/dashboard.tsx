@@ -3,6 +3,8 @@ import { useRouter } from 'next/router';
 import { useAuthContext } from '@/lib/AuthContext';
 import Layout from '@/components/Layout';
 import { getUserProfile, getUserWorkouts } from '@/lib/firebase';
+import { getHistorySummary } from '@/lib/api';
+import { HistorySummary } from '@/lib/types';
 import Link from 'next/link';
 import { doc, setDoc, getDoc, getFirestore } from 'firebase/firestore';
 
@@ -34,6 +36,7 @@ const Dashboard: React.FC = () => {
   const router = useRouter();
   const [profile, setProfile] = useState<UserProfile | null>(null);
   const [workouts, setWorkouts] = useState<Workout[]>([]);
+  const [historySummary, setHistorySummary] = useState<HistorySummary | null>(null);
   const [loadingProfile, setLoadingProfile] = useState(true);
   const [error, setError] = useState('');
   
@@ -44,6 +47,15 @@ const Dashboard: React.FC = () => {
     }
   }, [user, loading, router]);
   
+  // Totals and streaks come from the backend history rollups
+  const fetchHistorySummary = async (userId: string) => {
+    try {
+      setHistorySummary(await getHistorySummary(userId));
+    } catch (err) {
+      console.warn('Dashboard: Failed to load history summary:', err);
+    }
+  };
+  
   useEffect(() => {
     const fetchUserData = async () => {
       if (user) {
@@ -81,6 +93,8 @@ const Dashboard: React.FC = () => {
             console.warn('Dashboard: Failed to load workouts:', workoutsResult.error);
             setError(prev => prev ? `${prev}, Failed to load workout history` : 'Failed to load workout history');
           }
+          
+          await fetchHistorySummary(user.uid);
         } catch (err: any) {
           console.error('Dashboard: Error fetching user data:', err);
           setError(err.message || 'Failed to load user data');
@@ -118,6 +132,8 @@ const Dashboard: React.FC = () => {
         console.warn('Dashboard: Failed to refresh workouts:', workoutsResult.error);
         setError('Failed to refresh workout data');
       }
+      
+      await fetchHistorySummary(user.uid);
     } catch (err: any) {
       console.error('Dashboard: Error refreshing data:', err);
       setError(err.message || 'Failed to refresh data');
@@ -189,9 +205,6 @@ const Dashboard: React.FC = () => {
 
   // Calculate some stats
   const totalWorkouts = workouts.length;
-  const totalReps = workouts.reduce((sum, workout) => {
-    return sum + workout.results.reduce((exerciseSum, result) => exerciseSum + result.reps, 0);
-  }, 0);
   
   // Calculate total calories burned across all workouts
   const totalCaloriesBurned = workouts.reduce((sum, workout) => {
@@ -326,6 +339,37 @@ const Dashboard: React.FC = () => {
           )}
         </div>
         
+        {/* History Totals & Streaks */}
+        {historySummary && (
+          <div className="grid grid-cols-1 md:grid-cols-3 gap-6 mb-8">
+            <div className="stat-card">
+              <div className="text-gray-500 text-sm font-medium mb-1">Total Reps</div>
+              <div className="text-3xl font-bold text-gray-900">{historySummary.total_reps}</div>
+              <div className="mt-1 text-xs text-gray-500">
+                {historySummary.total_cycles} set{historySummary.total_cycles !== 1 ? 's' : ''} recorded
+              </div>
+            </div>
+            
+            <div className="stat-card">
+              <div className="text-gray-500 text-sm font-medium mb-1">Current Streak</div>
+              <div className="text-3xl font-bold text-gray-900">
+                {historySummary.current_streak} day{historySummary.current_streak !== 1 ? 's' : ''}
+              </div>
+              <div className="mt-1 text-xs text-gray-500">
+                {historySummary.last_workout_day ? `Last active: ${historySummary.last_workout_day}` : 'No workouts yet'}
+              </div>
+            </div>
+            
+            <div className="stat-card">
+              <div className="text-gray-500 text-sm font-medium mb-1">Longest Streak</div>
+              <div className="text-3xl font-bold text-gray-900">
+                {historySummary.longest_streak} day{historySummary.longest_streak !== 1 ? 's' : ''}
+              </div>
+              <div className="mt-1 text-xs text-gray-500">All time</div>
+            </div>
+          </div>
+        )}
+        
         {/* Recent Workouts & Quick Actions */}
         <div className="grid grid-cols-1 lg:grid-cols-3 gap-6">
           <div className="lg:col-span-2">
@@ -3,6 +3,8 @@ import { useRouter } from 'next/router';
 import { useAuthContext } from '@/lib/AuthContext';
 import Layout from '@/components/Layout';
 import { getUserWorkouts } from '@/lib/firebase';
+import { getHistoryCycles } from '@/lib/api';
+import { HistoryCycle } from '@/lib/types';
 import Link from 'next/link';
 
 interface WorkoutResult {
@@ -16,12 +18,17 @@ interface Workout {
   results: WorkoutResult[];
 }
 
+const CYCLES_PAGE_SIZE = 20;
+
 const HistoryPage: React.FC = () => {
   const { user, loading } = useAuthContext();
   const router = useRouter();
   const [workouts, setWorkouts] = useState<Workout[]>([]);
   const [isLoading, setIsLoading] = useState(true);
   const [error, setError] = useState('');
+  const [cycles, setCycles] = useState<HistoryCycle[]>([]);
+  const [nextCursor, setNextCursor] = useState<string | null>(null);
+  const [loadingCycles, setLoadingCycles] = useState(false);
   
   useEffect(() => {
     // If not logged in, redirect to login page
@@ -57,6 +64,26 @@ const HistoryPage: React.FC = () => {
     fetchWorkoutHistory();
   }, [user]);
   
+  // Page through the sets recorded in the backend history, newest first
+  const loadCycles = async (cursor?: string) => {
+    if (!user) return;
+    
+    try {
+      setLoadingCycles(true);
+      const page = await getHistoryCycles(user.uid, { limit: CYCLES_PAGE_SIZE, cursor });
+      setCycles(prev => cursor ? [...prev, ...page.cycles] : page.cycles);
+      setNextCursor(page.nextCursor);
+    } catch (err) {
+      console.warn('History: Failed to load recorded sets:', err);
+    } finally {
+      setLoadingCycles(false);
+    }
+  };
+  
+  useEffect(() => {
+    loadCycles();
+  }, [user]);
+  
   if (loading || isLoading) {
     return (
       <Layout>
@@ -147,6 +174,62 @@ const HistoryPage: React.FC = () => {
             ))}
           </div>
         )}
+        
+        {cycles.length > 0 && (
+          <div className="card mt-8">
+            <h2 className="text-xl font-semibold mb-4">Recorded Sets</h2>
+            <div className="overflow-x-auto">
+              <table className="min-w-full divide-y divide-gray-200">
+                <thead className="bg-gray-50">
+                  <tr>
+                    <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">
+                      Date
+                    </th>
+                    <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">
+                      Set
+                    </th>
+                    <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">
+                      Exercise
+                    </th>
+                    <th className="px-6 py-3 text-left text-xs font-medium text-gray-500 uppercase tracking-wider">
+                      Repetitions
+                    </th>
+                  </tr>
+                </thead>
+                <tbody className="bg-white divide-y divide-gray-200">
+                  {cycles.map((cycle) => (
+                    <tr key={cycle.id}>
+                      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
+                        {new Date(cycle.completed_at * 1000).toLocaleString()}
+                      </td>
+                      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
+                        {cycle.set_number}
+                      </td>
+                      <td className="px-6 py-4 whitespace-nowrap text-sm font-medium text-gray-900">
+                        {cycle.exercise}
+                      </td>
+                      <td className="px-6 py-4 whitespace-nowrap text-sm text-gray-500">
+                        {cycle.reps}
+                      </td>
+                    </tr>
+                  ))}
+                </tbody>
+              </table>
+            </div>
+            
+            {nextCursor && (
+              <div className="mt-4 text-center">
+                <button
+                  onClick={() => loadCycles(nextCursor)}
+                  className="px-4 py-2 bg-gray-100 hover:bg-gray-200 rounded-lg"
+                  disabled={loadingCycles}
+                >
+                  {loadingCycles ? 'Loading...' : 'Load More'}
+                </button>
+              </div>
+            )}
+          </div>
+        )}
       </div>
     </Layout>
   );
@@ -6,6 +6,7 @@ import WorkoutTimer from '@/components/WorkoutTimer';
 import { WorkoutData, WorkoutResults, FlattenedExercise } from '@/lib/types';
 import { useAuthContext } from '@/lib/AuthContext';
 import { getUserProfile, calculateCaloriesBurned } from '@/lib/firebase';
+import { recordWorkoutCycle } from '@/lib/api';
 import { useRouter } from 'next/router';
 
 const WorkoutPage: React.FC = () => {
@@ -324,6 +325,11 @@ const WorkoutPage: React.FC = () => {
       
       setResults(prev => [...prev, newResult]);
       setTotalCaloriesBurned(prevTotal => prevTotal + calories);
+      
+      // Update the backend history rollups as each cycle completes
+      if (user) {
+        recordWorkoutCycle(user.uid, newResult);
+      }
       setRepCount(0);
       
       // Enter rest phase